@@ -1,22 +1,29 @@
+from __future__ import annotations
+
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import os
 import io
+import argparse
+import contextlib
+import importlib
 import queue
 import random
+import re
 import platform
 import webbrowser
-import requests
-import tkinter as tk
-from tkinter import messagebox, ttk
-from PIL import Image, ImageDraw, ImageFont, ImageTk
 from io import BytesIO
 import json
-import vdf
 import sys
-from concurrent.futures import ThreadPoolExecutor
-import time
-import winreg
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import select
+import shutil
+import sqlite3
+import struct
 import threading
-from functools import lru_cache
+import zlib
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -26,8 +33,51 @@ ANIMATION_DURATION_MS = 7600   # total desired spin duration
 FRAME_DELAY_MS = 16            # ~60 FPS
 SLOWDOWN_FACTOR = 0.95         # speed multiplier each frame during deceleration
 MIN_SPEED = 5                  # pixels/frame floor during slowdown
-PRELOAD_WORKERS = 10           # threads used for parallel image pre-load
+REEL_SLOTS = 3                 # canvas items recycled by the spin reel
+REEL_LOOKAHEAD = 12            # strip images prepared ahead of the reel
+REEL_WORKERS = 4               # threads scaling strip images during a spin
+REEL_FINAL_WAIT_S = 5.0        # longest the reel waits for the winner's image
+IMAGE_CACHE_BUDGET_BYTES = 64 * 2**20     # in-memory header cache, encoded bytes
+DECODED_CACHE_BUDGET_BYTES = 32 * 2**20   # of which kept decoded (most recently used)
+IMAGE_CACHE_STRIPES = 16                  # independently locked shards of the cache
+ICON_SIZE = 20                 # px, exclude-list icons (one atlas slot each)
+DOWNLOAD_WORKERS = 16          # image requests on the wire at once (threads)
+DOWNLOAD_PER_HOST = 8          # … of which against any one image host
+DOWNLOAD_TIMEOUT_S = 10.0      # per-request timeout for image downloads
+DOWNLOAD_CHUNK = 64 * 1024     # bytes read/written per step while streaming
+IMAGE_META_SUFFIX = ".meta"    # validator sidecar next to each downloaded image
+IMAGE_REVALIDATE_AFTER_S = 7 * 24 * 3600   # ask the CDN again after a week
+NEGATIVE_TTL_MISSING_S = 7 * 24 * 3600     # don't retry a 404ing image URL for a week
+NEGATIVE_TTL_ERROR_S = 30 * 60             # … or one that timed out / errored for 30 min
+HOST_LATENCY_ALPHA = 0.2       # weight of a new sample in each host's moving average
+SCAN_WORKERS_PER_LIBRARY = 4   # threads parsing manifests within one library root
+SLOW_LIBRARY_SCAN_S = 2.0      # flag libraries that take longer than this to scan
+SCAN_STREAM_BATCH = 50         # manifests per batch handed to the GUI while scanning
+MIN_SPIN_POOL = 10             # spin is enabled once this many games have streamed in
+WATCH_POLL_INTERVAL_S = 5.0    # library watcher poll interval when inotify is unavailable
+WATCH_DEBOUNCE_S = 1.0         # quiet period before applying inotify events
 IMAGE_CACHE_SUBDIR = "image_cache"
+ICON_ATLAS_FILE = "icon_atlas"              # inside image_cache: .bin slots + .json index
+DERIVED_CACHE_SUBDIR = "derived"           # pre-scaled renditions, inside image_cache
+STATE_DB_FILE = "steam_roulette.db"   # manifest index, image URL history, achievements
+DISCOVERY_CACHE_FILE = "steam_discovery.json"
+SHORTCUTS_CACHE_FILE = "shortcuts_cache.json"
+DISCOVERY_MAX_AGE_S = 7 * 24 * 3600          # full Steam re-probe at most once a week
+SNAPSHOT_FILE = "session_snapshot.bin"       # warm-start state, written on exit
+OWNED_GAMES_FILE = "owned_games.bin"         # last GetOwnedGames answer (snapshot format)
+OWNED_GAMES_TTL_S = 6 * 3600                 # reuse it for this long
+OWNED_GAMES_ACHIEVEMENT_MAX_AGE_S = 10 * 60  # … but fresher for achievement checks
+OWNED_FILTER_CHUNK = 100       # app ids per appids_filter request
+ACHIEVEMENT_SCHEMA_TTL_S = 30 * 24 * 3600    # whether a game has achievements rarely changes
+ACHIEVEMENT_PROGRESS_MAX_AGE_S = 30 * 24 * 3600   # re-check even if never played again
+ACHIEVEMENT_PROGRESS_TTL_S = 24 * 3600       # … or after a day when last-played is unknown
+ACHIEVEMENT_WORKERS = 8        # concurrent GetPlayerAchievements requests
+API_RATE_PER_S = 10.0          # Steam Web API requests per second (token bucket refill)
+API_BURST = 10                 # … and how many may go out back to back
+API_RETRIES = 3                # retries of a 429 / 5xx / network failure
+API_BACKOFF_S = 1.0            # first retry delay, doubled each time (±50% jitter)
+API_BACKOFF_MAX_S = 30.0
+API_TIMEOUT_S = 10.0
 
 # Steam tool/redistributable app IDs that should never appear as spinnable games
 NON_GAME_APP_IDS = {
@@ -48,6 +98,122 @@ NON_GAME_APP_IDS = {
     "3419430", # Bongo Cat
 }
 
+# appinfo.vdf "type" values (lower-cased) that are never spinnable games
+NON_GAME_APP_TYPES = {"tool", "config", "application", "dlc", "music", "video", "driver"}
+ACHIEVEMENTS_CATEGORY_ID = 22   # Steam store category "Steam Achievements"
+STARTUP_BUDGET_S = 1.0          # --startup-report flags a slower time-to-first-window
+
+
+# ---------------------------------------------------------------------------
+# Lazy imports
+# ---------------------------------------------------------------------------
+_lazy_import_times: dict = {}
+
+
+class _LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    Tk, Pillow, requests and vdf together cost more than the rest of startup;
+    the --spin path never touches most of them. First-use import times are
+    kept in _lazy_import_times for the startup report. PyInstaller cannot
+    see these imports: list each one in SteamRoulette.spec's hiddenimports.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self._name)
+            _lazy_import_times.setdefault(self._name, time.perf_counter() - start)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+tk = _LazyModule("tkinter")
+messagebox = _LazyModule("tkinter.messagebox")
+ttk = _LazyModule("tkinter.ttk")
+Image = _LazyModule("PIL.Image")
+ImageDraw = _LazyModule("PIL.ImageDraw")
+ImageFont = _LazyModule("PIL.ImageFont")
+ImageTk = _LazyModule("PIL.ImageTk")
+requests = _LazyModule("requests")
+vdf = _LazyModule("vdf")
+asyncio = _LazyModule("asyncio")
+
+
+# ---------------------------------------------------------------------------
+# Startup timing (--startup-report)
+# ---------------------------------------------------------------------------
+_startup_marks: list = []
+
+
+def _process_age() -> float:
+    """Seconds since the OS created this process. Where that cannot be asked
+    for, the CPU time used so far (start-up is CPU-bound, so close to it)."""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/stat", "rb") as fh:
+                # Field 22, counted after the parenthesised command name
+                start_ticks = int(fh.read().rsplit(b")", 1)[1].split()[19])
+            return (time.clock_gettime(time.CLOCK_BOOTTIME)
+                    - start_ticks / os.sysconf("SC_CLK_TCK"))
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+            created, now, unused = (ctypes.c_ulonglong(), ctypes.c_ulonglong(),
+                                    ctypes.c_ulonglong())
+            if kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(created),
+                                        ctypes.byref(unused), ctypes.byref(unused),
+                                        ctypes.byref(unused)):
+                kernel32.GetSystemTimePreciseAsFileTime(ctypes.byref(now))
+                return (now.value - created.value) / 1e7   # FILETIME: 100 ns units
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return time.process_time()
+
+
+def startup_mark(label: str) -> None:
+    """Record that a startup phase finished now."""
+    _startup_marks.append((label, time.perf_counter()))
+
+
+def startup_report(budget_s: float = STARTUP_BUDGET_S) -> tuple:
+    """Format the recorded startup phases, `-X importtime` style.
+
+    Returns (text, within_budget). Times are measured from process creation:
+    the first phase is interpreter start-up plus compiling this script, which
+    runs as __main__ and so is never bytecode-cached.
+    """
+    process_t0 = time.perf_counter() - _process_age()
+    lines = [f"[Startup] {'phase':<28}{'self ms':>10}{'total ms':>10}",
+             f"[Startup] {'interpreter + compile':<28}{(_STARTUP_T0 - process_t0) * 1000:>10.1f}"
+             f"{(_STARTUP_T0 - process_t0) * 1000:>10.1f}"]
+    previous = _STARTUP_T0
+    for label, t in _startup_marks:
+        lines.append(f"[Startup] {label:<28}{(t - previous) * 1000:>10.1f}"
+                     f"{(t - process_t0) * 1000:>10.1f}")
+        previous = t
+    for name, seconds in sorted(_lazy_import_times.items(), key=lambda kv: -kv[1]):
+        lines.append(f"[Startup]   import {name:<21}{seconds * 1000:>10.1f}")
+    total = (_startup_marks[-1][1] if _startup_marks else previous) - process_t0
+    within = total <= budget_s
+    lines.append(f"[Startup] time to {_startup_marks[-1][0] if _startup_marks else 'import'}: "
+                 f"{total * 1000:.1f} ms (budget {budget_s * 1000:.0f} ms)"
+                 f"{'' if within else ' — OVER BUDGET'}")
+    return "\n".join(lines), within
+
 
 # ---------------------------------------------------------------------------
 # Path helpers
@@ -76,28 +242,120 @@ def resource_path(relative_path: str) -> str:
 # ---------------------------------------------------------------------------
 # Steam installation discovery
 # ---------------------------------------------------------------------------
+FLATPAK_STEAM_ID = "com.valvesoftware.Steam"
+
+
 def get_steam_install_path() -> str | None:
+    """SteamPath from the Windows registry, or None (always None off Windows)."""
+    try:
+        import winreg
+    except ImportError:
+        return None
     try:
         key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam")
         path, _ = winreg.QueryValueEx(key, "SteamPath")
-        return path
-    except FileNotFoundError:
+        return os.path.normpath(path)
+    except OSError:
         return None
 
 
-def find_steam_path_fallback() -> str | None:
-    candidates = [
-        r"C:\Program Files (x86)\Steam",
-        r"C:\Program Files\Steam",
-        os.path.expanduser(r"~\AppData\Local\Steam"),
+def steam_path_candidates(system: str | None = None, home: str | None = None) -> list:
+    """Well-known Steam install locations for the given platform, most likely first."""
+    system = system or platform.system()
+    home = home or os.path.expanduser("~")
+    if system == "Windows":
+        return [
+            r"C:\Program Files (x86)\Steam",
+            r"C:\Program Files\Steam",
+            os.path.join(home, "AppData", "Local", "Steam"),
+        ]
+    if system == "Darwin":
+        return [os.path.join(home, "Library", "Application Support", "Steam")]
+    flatpak = os.path.join(home, ".var", "app", FLATPAK_STEAM_ID)
+    return [
+        os.path.join(home, ".steam", "steam"),
+        os.path.join(home, ".steam", "root"),
+        os.path.join(home, ".local", "share", "Steam"),
+        os.path.join(flatpak, ".local", "share", "Steam"),
+        os.path.join(flatpak, "data", "Steam"),
     ]
-    for p in candidates:
-        if os.path.exists(os.path.join(p, "steam.exe")):
-            return p
+
+
+def is_steam_root(path: str) -> bool:
+    """True if path looks like a Steam installation directory."""
+    return (os.path.isfile(os.path.join(path, "steam.exe"))
+            or os.path.isdir(os.path.join(path, "steamapps")))
+
+
+def find_steam_path_fallback(system: str | None = None, home: str | None = None) -> str | None:
+    for p in steam_path_candidates(system, home):
+        if is_steam_root(p):
+            # ~/.steam/steam is normally a symlink into ~/.local/share/Steam
+            return os.path.realpath(p)
     return None
 
 
-STEAM_PATH = get_steam_install_path() or find_steam_path_fallback()
+def _stat_key(path: str) -> list | None:
+    try:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+def discover_steam(cache_file: str | None = None, max_age: float = DISCOVERY_MAX_AGE_S,
+                   system: str | None = None, home: str | None = None) -> dict | None:
+    """Locate Steam and its library folders, reusing a cached result when valid.
+
+    Returns {"steam_path": str, "libraries": [str, …]} or None if Steam could
+    not be found. A cached result younger than max_age is reused as long as the
+    Steam directory still exists; its library list is only re-read when
+    libraryfolders.vdf has changed. Older results trigger a full probe of the
+    registry (Windows) and the well-known install locations.
+    """
+    cached = None
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, "r") as fh:
+                cached = json.load(fh)
+        except Exception as e:
+            print(f"[Steam] Ignoring unreadable discovery cache: {e}")
+
+    if (cached and cached.get("steam_path")
+            and time.time() - cached.get("checked_at", 0) < max_age
+            and is_steam_root(cached["steam_path"])):
+        steam_path = cached["steam_path"]
+        folders_stat = _stat_key(os.path.join(steam_path, "steamapps", "libraryfolders.vdf"))
+        if folders_stat == cached.get("folders_stat"):
+            return {"steam_path": steam_path, "libraries": cached.get("libraries", [])}
+        checked_at = cached["checked_at"]
+    else:
+        steam_path = None
+        if (system or platform.system()) == "Windows":
+            steam_path = get_steam_install_path()
+            if steam_path and not is_steam_root(steam_path):
+                steam_path = None
+        steam_path = steam_path or find_steam_path_fallback(system, home)
+        if not steam_path:
+            return None
+        checked_at = time.time()
+        print(f"[Steam] Found Steam at {steam_path}")
+
+    folders_vdf = os.path.join(steam_path, "steamapps", "libraryfolders.vdf")
+    result = {
+        "steam_path": steam_path,
+        "libraries": get_library_paths(steam_path),
+    }
+    if cache_file:
+        try:
+            with open(cache_file, "w") as fh:
+                json.dump(dict(result, checked_at=checked_at,
+                               folders_stat=_stat_key(folders_vdf)), fh)
+        except Exception as e:
+            print(f"[Steam] Could not save discovery cache: {e}")
+    return result
+
+
 ICON_PATH = resource_path("SteamRouletteIcon.ico")
 
 
@@ -113,26 +371,160 @@ def create_cache_directory() -> str:
 # ---------------------------------------------------------------------------
 # VDF / ACF parsing
 # ---------------------------------------------------------------------------
+_VDF_TOKEN = re.compile(
+    rb'\s*(?://[^\n]*\s*)*'                      # whitespace and // comments
+    rb'(?:"((?:[^"\\]|\\.)*)"|([{}])|([^\s{}"]+))', re.S)
+_VDF_SKIP = re.compile(                         # everything up to the next brace
+    rb'[^{}"/]*(?:(?:"(?:[^"\\]|\\.)*"|//[^\n]*|/)[^{}"/]*)*([{}])', re.S)
+_VDF_ESCAPES = {"n": "\n", "t": "\t", "v": "\v", "b": "\b", "r": "\r",
+                "f": "\f", "a": "\a", "\\": "\\", "?": "?", '"': '"', "'": "'"}
+_VDF_ESCAPE_RE = re.compile(r"\\([ntvbrfa\\?\"'])")
+ACF_READ_CHUNK = 8192   # bytes read before falling back to the whole manifest
+
+
+class _TruncatedVdf(Exception):
+    """The buffer ended before the requested fields could be read."""
+
+
+class _VdfReader:
+    """Token reader over a text-VDF byte buffer that can skip whole blocks.
+
+    Only the tokens that are actually looked at are decoded; skip_block() jumps
+    over a nested section by brace counting without building anything.
+    """
+
+    def __init__(self, data: bytes, eof: bool = True):
+        self.data = data
+        self.eof = eof
+        self.pos = 3 if data.startswith(b"\xef\xbb\xbf") else 0
+
+    def token(self) -> tuple | None:
+        """Return ("str", text), ("{", None), ("}", None) or None at the end."""
+        while True:
+            m = _VDF_TOKEN.match(self.data, self.pos)
+            if m is None:
+                if not self.eof and self.data[self.pos:].strip():
+                    raise _TruncatedVdf
+                return None
+            self.pos = m.end()
+            quoted, brace, bare = m.groups()
+            if brace is not None:
+                return brace.decode(), None
+            if bare is not None:
+                if not self.eof and m.end() == len(self.data):
+                    raise _TruncatedVdf
+                if bare.startswith(b"["):
+                    continue   # conditional such as [$WIN32] — not used in manifests
+                return "str", bare.decode("utf-8")
+            text = quoted.decode("utf-8")
+            if "\\" in text:
+                text = _VDF_ESCAPE_RE.sub(lambda e: _VDF_ESCAPES[e.group(1)], text)
+            return "str", text
+
+    def skip_block(self) -> None:
+        """Advance past the '}' matching an already-consumed '{'."""
+        depth = 1
+        for m in _VDF_SKIP.finditer(self.data, self.pos):
+            c = m.group(1)
+            if c == b"{":
+                depth += 1
+            elif c == b"}":
+                depth -= 1
+                if depth == 0:
+                    self.pos = m.end()
+                    return
+        if not self.eof:
+            raise _TruncatedVdf
+        raise ValueError("unclosed block in VDF data")
+
+    def enter(self, section: str) -> bool:
+        """Scan top-level keys until `section {` is entered. False if absent."""
+        while True:
+            tok = self.token()
+            if tok is None:
+                return False
+            if tok[0] != "str":
+                raise ValueError(f"unexpected {tok[0]!r} in VDF data")
+            key = tok[1]
+            nxt = self.token()
+            if nxt is None:
+                return False
+            if nxt[0] == "{":
+                if key == section:
+                    return True
+                self.skip_block()
+
+    def fields(self, wanted) -> dict:
+        """Collect scalar `wanted` keys in the current block, stopping as soon as
+        all are found or the block closes. Sub-blocks are skipped."""
+        found: dict = {}
+        while len(found) < len(wanted):
+            tok = self.token()
+            if tok is None or tok[0] == "}":
+                break
+            if tok[0] != "str":
+                raise ValueError("unexpected '{' in VDF data")
+            key = tok[1]
+            value = self.token()
+            if value is None:
+                break
+            if value[0] == "{":
+                self.skip_block()
+            elif value[0] == "str" and key in wanted and key not in found:
+                found[key] = value[1]
+        return found
+
+
+def read_vdf_fields(path: str, section: str, wanted) -> dict:
+    """Read only the `wanted` scalar keys of a top-level `section` in a text
+    VDF file. The first ACF_READ_CHUNK bytes are tried first; the rest of the
+    file is read only if the fields were not all found in that prefix."""
+    wanted = frozenset(wanted)
+    with open(path, "rb") as fh:
+        data = fh.read(ACF_READ_CHUNK)
+        eof = len(data) < ACF_READ_CHUNK
+        if not eof:
+            try:
+                reader = _VdfReader(data, eof=False)
+                if reader.enter(section):
+                    found = reader.fields(wanted)
+                    if len(found) == len(wanted):
+                        return found
+            except _TruncatedVdf:
+                pass
+            data += fh.read()
+    reader = _VdfReader(data)
+    return reader.fields(wanted) if reader.enter(section) else {}
+
+
 def parse_vdf(file_path: str) -> dict:
     try:
-        with open(file_path, "r", encoding="utf-8") as fh:
-            content = vdf.parse(fh)
-        libraries = content.get("libraryfolders", {})
-        return {
-            key: value.get("path")
-            for key, value in libraries.items()
-            if isinstance(value, dict) and "path" in value
-        }
+        with open(file_path, "rb") as fh:
+            reader = _VdfReader(fh.read())
+        libraries = {}
+        if reader.enter("libraryfolders"):
+            while True:
+                tok = reader.token()
+                if tok is None or tok[0] == "}":
+                    break
+                value = reader.token()
+                if value is not None and value[0] == "{":
+                    path = reader.fields({"path"}).get("path")
+                    if path is not None:
+                        libraries[tok[1]] = path
+                        # Skip the rest of this library's block ("apps" etc.)
+                        reader.skip_block()
+                elif value is None:
+                    break
+        return libraries
     except Exception as e:
         print(f"Error parsing VDF file: {e}")
         return {}
 
 
-@lru_cache(maxsize=None)
 def fetch_game_data(acf_path: str, library_path: str) -> dict:
     try:
-        with open(acf_path, "r", encoding="utf-8") as fh:
-            content = vdf.parse(fh).get("AppState", {})
+        content = read_vdf_fields(acf_path, "AppState", ("appid", "name"))
         return {
             "app_id": content.get("appid"),
             "name": content.get("name"),
@@ -143,18 +535,289 @@ def fetch_game_data(acf_path: str, library_path: str) -> dict:
         return {}
 
 
-def get_installed_games(steam_path: str) -> list:
+# ---------------------------------------------------------------------------
+# Persistent state (one SQLite file next to the exe)
+# ---------------------------------------------------------------------------
+_state_dbs: dict = {}                # db_path → shared sqlite3 connection
+_state_db_lock = threading.Lock()    # opening connections and every write transaction
+
+
+def _state_db(db_path: str) -> sqlite3.Connection:
+    """The shared connection to db_path, opened on first use."""
+    conn = _state_dbs.get(db_path)
+    if conn is None:
+        with _state_db_lock:
+            conn = _state_dbs.get(db_path)
+            if conn is None:
+                conn = _state_dbs[db_path] = sqlite3.connect(db_path, check_same_thread=False)
+    return conn
+
+
+class PersistedTable:
+    """One table of the state database, mirrored in memory.
+
+    `rows` maps the primary key (a tuple when it spans several columns) to a
+    tuple of the other columns, in the order given. Owners read `rows`
+    directly and change it only through set(), pop() and clear(), under their
+    own lock; save() then writes just the changed rows. If the database
+    cannot be opened the table is kept in memory only.
+    """
+
+    def __init__(self, db_path: str, name: str, key_columns: tuple, value_columns: tuple,
+                 description: str, tag: str):
+        self.name = name
+        self.description = description
+        self.tag = tag
+        self.rows: dict = {}
+        self._dirty: set = set()     # keys whose row must be written
+        self._removed: set = set()   # keys whose row must be deleted
+        self._single_key = len(key_columns) == 1
+        keys = [c.split()[0] for c in key_columns]
+        columns = keys + [c.split()[0] for c in value_columns]
+        self._select = f"SELECT {', '.join(columns)} FROM {name}"
+        self._delete = f"DELETE FROM {name} WHERE " + " AND ".join(f"{k} = ?" for k in keys)
+        self._insert = (f"INSERT OR REPLACE INTO {name} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join('?' * len(columns))})")
+        try:
+            self._conn = _state_db(db_path)
+            with _state_db_lock:
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} ("
+                    f"{', '.join(key_columns + value_columns)}, PRIMARY KEY ({', '.join(keys)}))")
+                for row in self._conn.execute(self._select):
+                    key = row[0] if self._single_key else row[:len(keys)]
+                    self.rows[key] = row[len(keys):]
+        except sqlite3.Error as e:
+            print(f"{tag} Could not open the {description} ({e}) — it will not be kept.")
+            self._conn = None
+            self.rows = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def set(self, key, values: tuple) -> None:
+        self.rows[key] = tuple(values)
+        self._dirty.add(key)
+        self._removed.discard(key)
+
+    def pop(self, key):
+        """Remove key's row (deleted on the next save); returns its values."""
+        values = self.rows.pop(key, None)
+        if values is not None:
+            self._dirty.discard(key)
+            self._removed.add(key)
+        return values
+
+    def clear(self) -> None:
+        self._removed.update(self.rows)
+        self.rows.clear()
+        self._dirty.clear()
+
+    def save(self) -> int:
+        """Write changed rows and delete removed ones in one transaction.
+        Returns the number of removed rows."""
+        keys = (lambda k: (k,)) if self._single_key else tuple
+        removed = [keys(k) for k in self._removed]
+        dirty = [(*keys(k), *self.rows[k]) for k in self._dirty if k in self.rows]
+        self._removed = set()
+        self._dirty.clear()
+        if self._conn is not None and (removed or dirty):
+            try:
+                with _state_db_lock, self._conn:
+                    self._conn.executemany(self._delete, removed)
+                    self._conn.executemany(self._insert, dirty)
+            except sqlite3.Error as e:
+                print(f"{self.tag} Could not save the {self.description}: {e}")
+        return len(removed)
+
+
+class LibraryIndex:
+    """Persistent index of parsed appmanifest files keyed by (path, mtime, size).
+
+    A manifest is only re-parsed when its mtime or size differs from the indexed
+    row; rows for manifests that were not seen during the last scan are dropped
+    when the index is saved.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # acf_path → (mtime_ns, size, library_path, app_id, name)
+        self._rows = PersistedTable(
+            db_path, "acf_index", ("acf_path TEXT",),
+            ("mtime_ns INTEGER NOT NULL", "size INTEGER NOT NULL",
+             "library_path TEXT", "app_id TEXT", "name TEXT"),
+            "library index", "[Index]")
+        self._seen: set = set()    # acf_paths looked up since the last save
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, acf_path: str, mtime_ns: int, size: int) -> dict | None:
+        """Return the indexed game record if the manifest is unchanged, else None."""
+        with self._lock:
+            self._seen.add(acf_path)
+            row = self._rows.rows.get(acf_path)
+            if row and row[0] == mtime_ns and row[1] == size:
+                self.hits += 1
+                return {"app_id": row[3], "name": row[4], "path": row[2]}
+            self.misses += 1
+            return None
+
+    def put(self, acf_path: str, mtime_ns: int, size: int, game: dict) -> None:
+        with self._lock:
+            self._seen.add(acf_path)
+            self._rows.set(acf_path, (
+                mtime_ns, size, game.get("path"),
+                None if game.get("app_id") is None else str(game["app_id"]),
+                game.get("name")))
+
+    def lookup(self, acf_path: str, library_path: str) -> dict:
+        """Stat acf_path and return its game record, parsing only on an index miss."""
+        try:
+            st = os.stat(acf_path)
+        except OSError as e:
+            print(f"Error reading ACF file {acf_path}: {e}")
+            return {}
+        game = self.get(acf_path, st.st_mtime_ns, st.st_size)
+        if game is not None and game.get("path") == library_path:
+            return game
+        game = fetch_game_data(acf_path, library_path)
+        if game:
+            self.put(acf_path, st.st_mtime_ns, st.st_size, game)
+        return game
+
+    def discard(self, acf_path: str) -> None:
+        """Forget a manifest that was deleted; the row is removed on the next save."""
+        with self._lock:
+            self._rows.pop(acf_path)
+
+    def save(self, prune: bool = True) -> int:
+        """Flush changed rows to disk. With prune, rows not seen since the last
+        save are deleted. Returns the number of removed rows."""
+        with self._lock:
+            stale = [p for p in self._rows.rows if p not in self._seen] if prune else []
+            for p in stale:
+                self._rows.pop(p)
+            self._seen.clear()
+            return self._rows.save()
+
+
+def get_library_paths(steam_path: str) -> list:
+    """Library roots from libraryfolders.vdf that have a steamapps directory."""
     library_folders = parse_vdf(os.path.join(steam_path, "steamapps", "libraryfolders.vdf"))
-    installed_games = []
-    seen_ids: set = set()
+    libraries = []
     for library_path in library_folders.values():
         if not (library_path and isinstance(library_path, str)):
             continue
-        steamapps_path = os.path.join(library_path, "steamapps")
-        if not os.path.exists(steamapps_path):
+        if library_path in libraries:
             continue
-        for acf_file in filter(lambda f: f.endswith(".acf"), os.listdir(steamapps_path)):
-            game = fetch_game_data(os.path.join(steamapps_path, acf_file), library_path)
+        if not os.path.exists(os.path.join(library_path, "steamapps")):
+            continue
+        libraries.append(library_path)
+    return libraries
+
+
+def _read_manifest(acf_path: str, library_path: str, index: LibraryIndex | None) -> dict:
+    if index is not None:
+        return index.lookup(acf_path, library_path)
+    return fetch_game_data(acf_path, library_path)
+
+
+def _collect_batches(records, on_batch=None) -> list:
+    """Drain records into a list, handing every SCAN_STREAM_BATCH of them to
+    on_batch as they arrive."""
+    games, batch = [], []
+    for record in records:
+        games.append(record)
+        if on_batch is not None:
+            batch.append(record)
+            if len(batch) >= SCAN_STREAM_BATCH:
+                on_batch(batch)
+                batch = []
+    if batch:
+        on_batch(batch)
+    return games
+
+
+def scan_library(library_path: str, index: LibraryIndex | None = None,
+                 workers: int = SCAN_WORKERS_PER_LIBRARY, on_batch=None) -> list:
+    """Read every appmanifest in one library, in filename order.
+
+    Manifests are parsed in a pool of at most `workers` threads; pass workers=1
+    for a purely serial scan. Invalid entries are returned as-is so the caller
+    can report them. If on_batch is given it also receives the records in
+    batches while the scan is still running.
+    """
+    steamapps_path = os.path.join(library_path, "steamapps")
+    try:
+        acf_files = sorted(f for f in os.listdir(steamapps_path) if f.endswith(".acf"))
+    except OSError:
+        return []
+    acf_paths = [os.path.join(steamapps_path, f) for f in acf_files]
+    if workers <= 1 or len(acf_paths) <= 1:
+        return _collect_batches((_read_manifest(p, library_path, index) for p in acf_paths),
+                                on_batch)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return _collect_batches(
+            ex.map(lambda p: _read_manifest(p, library_path, index), acf_paths), on_batch)
+
+
+def get_installed_games(steam_path: str, index: LibraryIndex | None = None,
+                        parallel: bool = True, timings: dict | None = None,
+                        libraries: list | None = None, on_batch=None) -> list:
+    """Scan every Steam library for installed games.
+
+    With parallel=True each library root is scanned by its own worker (so a
+    slow drive does not hold up the others) and results are merged in
+    libraryfolders.vdf order, giving the same list a serial scan would.
+    Per-library scan times in seconds are written into `timings` if given.
+    Pass `libraries` to skip re-reading libraryfolders.vdf.
+
+    on_batch(games), if given, is called from the scan threads with valid,
+    not-yet-seen games as soon as each batch of manifests has been read, so
+    a caller can show the library before the slowest drive has finished.
+    """
+    if libraries is None:
+        libraries = get_library_paths(steam_path)
+
+    streamed_ids: set = set()
+    stream_lock = threading.Lock()
+
+    def _stream(batch: list) -> None:
+        with stream_lock:
+            fresh = []
+            for game in batch:
+                app_id = str(game.get("app_id") or "") if game else ""
+                if app_id and app_id not in NON_GAME_APP_IDS and app_id not in streamed_ids:
+                    streamed_ids.add(app_id)
+                    fresh.append(game)
+        if fresh:
+            on_batch(fresh)
+
+    def _timed_scan(library_path: str) -> tuple:
+        start = time.perf_counter()
+        games = scan_library(library_path, index,
+                             SCAN_WORKERS_PER_LIBRARY if parallel else 1,
+                             on_batch=_stream if on_batch is not None else None)
+        return games, time.perf_counter() - start
+
+    if parallel and len(libraries) > 1:
+        with ThreadPoolExecutor(max_workers=len(libraries)) as ex:
+            results = list(ex.map(_timed_scan, libraries))
+    else:
+        results = [_timed_scan(lib) for lib in libraries]
+
+    installed_games = []
+    seen_ids: set = set()
+    for library_path, (games, elapsed) in zip(libraries, results):
+        slow = "  <-- slow" if elapsed >= SLOW_LIBRARY_SCAN_S else ""
+        print(f"[Scan] {library_path}: {len(games)} manifest(s) in {elapsed:.2f} s{slow}")
+        if timings is not None:
+            timings[library_path] = elapsed
+        for game in games:
             if not game or not game.get("app_id"):
                 print(f"Excluded invalid game entry: {game}")
                 continue
@@ -167,14 +830,852 @@ def get_installed_games(steam_path: str) -> list:
                 continue
             seen_ids.add(app_id)
             installed_games.append(game)
+    if index is not None:
+        pruned = index.save()
+        print(f"[Index] {index.hits} manifest(s) unchanged, {index.misses} parsed, "
+              f"{pruned} removed.")
+        index.hits = index.misses = 0
     return installed_games
 
 
+# ---------------------------------------------------------------------------
+# Library watcher
+# ---------------------------------------------------------------------------
+def _is_manifest(filename: str) -> bool:
+    return filename.startswith("appmanifest_") and filename.endswith(".acf")
+
+
+class LibraryWatcher:
+    """Background watcher that reports appmanifest changes as deltas.
+
+    Every steamapps directory is watched with inotify on Linux, or polled every
+    WATCH_POLL_INTERVAL_S seconds elsewhere. on_change(updated, removed) is
+    called from the watcher thread with the game records that were added or
+    changed and the app IDs that are no longer installed in any library.
+    Edits to libraryfolders.vdf add or drop whole libraries.
+    """
+
+    def __init__(self, steam_path: str, on_change, index: LibraryIndex | None = None,
+                 poll_interval: float = WATCH_POLL_INTERVAL_S):
+        self.steam_path = steam_path
+        self.on_change = on_change
+        self.index = index
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._libraries: dict = {}   # steamapps dir → library root
+        self._known: dict = {}       # acf_path → (mtime_ns, size, app_id)
+        self._folders_stat = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="LibraryWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self):
+        self._refresh_libraries(initial=True)
+        try:
+            inotify = _Inotify() if sys.platform.startswith("linux") else None
+        except OSError as e:
+            print(f"[Watch] inotify unavailable ({e}) — polling every {self.poll_interval:g} s.")
+            inotify = None
+        if inotify is None:
+            self._poll_loop()
+            return
+        print(f"[Watch] Watching {len(self._libraries)} library folder(s) with inotify.")
+        try:
+            self._inotify_loop(inotify)
+        finally:
+            inotify.close()
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            if self._folders_changed():
+                self._refresh_libraries()
+                continue
+            dirty = set()
+            for steamapps in self._libraries:
+                current = self._list_manifests(steamapps)
+                known = {p for p in self._known if os.path.dirname(p) == steamapps}
+                dirty |= current.keys() ^ known
+                dirty |= {p for p, st in current.items()
+                          if p in self._known and self._known[p][:2] != st}
+            if dirty:
+                self._apply(dirty)
+
+    def _inotify_loop(self, inotify: "_Inotify"):
+        watched: dict = {}   # watch descriptor → steamapps dir
+
+        def _sync_watches():
+            wanted = set(self._libraries) | {os.path.join(self.steam_path, "steamapps")}
+            for wd, path in list(watched.items()):
+                if path not in wanted:
+                    inotify.remove_watch(wd)
+                    del watched[wd]
+            for path in wanted - set(watched.values()):
+                try:
+                    watched[inotify.add_watch(path)] = path
+                except OSError as e:
+                    print(f"[Watch] Cannot watch {path}: {e}")
+
+        _sync_watches()
+        dirty: set = set()
+        last_event = 0.0
+        while not self._stop.is_set():
+            events = inotify.read(timeout=0.5)
+            for wd, mask, name in events:
+                if mask & _Inotify.IN_Q_OVERFLOW:
+                    # Events were dropped — fall back to a full comparison
+                    dirty |= set(self._known)
+                    for steamapps in self._libraries:
+                        dirty |= set(self._list_manifests(steamapps))
+                elif mask & _Inotify.IN_IGNORED:
+                    watched.pop(wd, None)
+                elif wd in watched and name == "libraryfolders.vdf":
+                    dirty.add(None)
+                elif wd in watched and _is_manifest(name):
+                    dirty.add(os.path.join(watched[wd], name))
+            if events:
+                last_event = time.monotonic()
+                continue
+            # Steam writes manifests several times in a row — wait for quiet
+            if dirty and time.monotonic() - last_event >= WATCH_DEBOUNCE_S:
+                if None in dirty:
+                    dirty.discard(None)
+                    if self._folders_changed():
+                        self._refresh_libraries()
+                        _sync_watches()
+                dirty = {p for p in dirty if os.path.dirname(p) in self._libraries}
+                if dirty:
+                    self._apply(dirty)
+                dirty = set()
+
+    # ------------------------------------------------------------------
+    # Delta computation
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _list_manifests(steamapps: str) -> dict:
+        manifests = {}
+        try:
+            with os.scandir(steamapps) as it:
+                for entry in it:
+                    if _is_manifest(entry.name):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        manifests[entry.path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return manifests
+
+    def _folders_changed(self) -> bool:
+        try:
+            st = os.stat(os.path.join(self.steam_path, "steamapps", "libraryfolders.vdf"))
+            current = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            current = None
+        return current != self._folders_stat
+
+    def _refresh_libraries(self, initial: bool = False):
+        try:
+            st = os.stat(os.path.join(self.steam_path, "steamapps", "libraryfolders.vdf"))
+            self._folders_stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            self._folders_stat = None
+        libraries = {os.path.join(lib, "steamapps"): lib
+                     for lib in get_library_paths(self.steam_path)}
+        dirty = {p for p in self._known if os.path.dirname(p) not in libraries}
+        added = [d for d in libraries if d not in self._libraries]
+        self._libraries = libraries
+        for steamapps in added:
+            dirty |= set(self._list_manifests(steamapps))
+        if initial:
+            # Learn the current state without reporting it as a change
+            self._apply(dirty, notify=False)
+        elif dirty:
+            self._apply(dirty)
+
+    def _apply(self, paths: set, notify: bool = True):
+        updated, removed_ids = [], set()
+        for acf_path in sorted(paths):
+            steamapps = os.path.dirname(acf_path)
+            try:
+                st = os.stat(acf_path)
+                present = steamapps in self._libraries
+            except OSError:
+                present = False
+            if not present:
+                old = self._known.pop(acf_path, None)
+                if self.index is not None:
+                    self.index.discard(acf_path)
+                if old and old[2]:
+                    removed_ids.add(old[2])
+                continue
+            game = _read_manifest(acf_path, self._libraries[steamapps], self.index)
+            app_id = str(game["app_id"]) if game and game.get("app_id") else None
+            old = self._known.get(acf_path)
+            self._known[acf_path] = (st.st_mtime_ns, st.st_size, app_id)
+            if old and old[2] and old[2] != app_id:
+                removed_ids.add(old[2])
+            if app_id and app_id not in NON_GAME_APP_IDS:
+                updated.append(game)
+
+        # An app removed from one library may still be installed in another
+        still_installed = {k[2] for k in self._known.values() if k[2]}
+        removed = sorted(removed_ids - still_installed)
+        if self.index is not None:
+            self.index.save(prune=False)
+        if notify and (updated or removed):
+            print(f"[Watch] {len(updated)} game(s) added/changed, {len(removed)} removed.")
+            try:
+                self.on_change(updated, removed)
+            except Exception as e:
+                print(f"[Watch] Error applying library changes: {e}")
+
+
+class _Inotify:
+    """Minimal ctypes wrapper around the Linux inotify API."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM  = 0x00000040
+    IN_MOVED_TO    = 0x00000080
+    IN_CREATE      = 0x00000100
+    IN_DELETE      = 0x00000200
+    IN_Q_OVERFLOW  = 0x00004000
+    IN_IGNORED     = 0x00008000
+    IN_NONBLOCK    = 0o4000
+    IN_CLOEXEC     = 0o2000000
+    _MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                                 use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("libc has no inotify_init1")
+        self._get_errno = ctypes.get_errno
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self._get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self._MASK)
+        if wd < 0:
+            raise OSError(self._get_errno(), os.strerror(self._get_errno()), path)
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout: float) -> list:
+        """Return [(wd, mask, name), …] for events available within timeout."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset + self._HEADER.size <= len(data):
+            wd, mask, _cookie, length = self._HEADER.unpack_from(data, offset)
+            offset += self._HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Binary appinfo.vdf (Steam's local app metadata cache)
+# ---------------------------------------------------------------------------
+_APPINFO_MAGICS = {0x07564427: 27, 0x07564428: 28, 0x07564429: 29}
+_BVDF_MAP, _BVDF_STRING, _BVDF_INT32, _BVDF_FLOAT32 = 0x00, 0x01, 0x02, 0x03
+_BVDF_POINTER, _BVDF_WSTRING, _BVDF_COLOR, _BVDF_UINT64 = 0x04, 0x05, 0x06, 0x07
+_BVDF_END, _BVDF_INT64, _BVDF_END_ALT = 0x08, 0x0A, 0x0B
+_BVDF_FIXED_SIZE = {_BVDF_INT32: 4, _BVDF_FLOAT32: 4, _BVDF_POINTER: 4,
+                    _BVDF_COLOR: 4, _BVDF_UINT64: 8, _BVDF_INT64: 8}
+
+
+class AppInfoReader:
+    """Memory-mapped reader for Steam's binary appcache/appinfo.vdf.
+
+    Only the entries that are asked for are decoded, and within those only the
+    appinfo → common section. Everything else is skipped using the per-entry
+    size field, so lookups never deserialize the whole (often several hundred
+    MB) file. Supports the v27, v28 and v29 (string-table) formats.
+
+    The file is mapped only for the duration of one get() call, so Steam is
+    free to rewrite it in between; when its (mtime, size) has changed since
+    the last call the offsets and decoded entries are thrown away.
+    """
+
+    _COMMON_STRINGS = ("name", "type", "icon", "clienticon")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fh = self._mm = None
+        self._stat: tuple | None = None
+        self._offsets: dict | None = None   # app_id → (blob start, entry end)
+        self._strings: list | None = None
+        self._results: dict = {}
+        with self._lock:
+            self._map()   # reject unreadable or unknown files up front
+            self.close()
+
+    @classmethod
+    def open(cls, steam_path: str | None) -> "AppInfoReader | None":
+        """Open <steam>/appcache/appinfo.vdf, or return None if unavailable."""
+        if not steam_path:
+            return None
+        path = os.path.join(steam_path, "appcache", "appinfo.vdf")
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[AppInfo] Cannot read {path}: {e}")
+            return None
+
+    def _map(self) -> None:
+        import mmap
+        self._fh = open(self.path, "rb")
+        try:
+            st = os.fstat(self._fh.fileno())
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, _universe = struct.unpack_from("<II", self._mm, 0)
+            if magic not in _APPINFO_MAGICS:
+                raise ValueError(f"unsupported appinfo.vdf magic 0x{magic:08x}")
+        except Exception:
+            self.close()
+            raise
+        if (st.st_mtime_ns, st.st_size) != self._stat:
+            self._stat = (st.st_mtime_ns, st.st_size)
+            self.version = _APPINFO_MAGICS[magic]
+            self._offsets = self._strings = None
+            self._results = {}
+
+    def close(self) -> None:
+        """Unmap the file; the next get() maps it again."""
+        try:
+            if self._mm is not None:
+                self._mm.close()
+        finally:
+            if self._fh is not None:
+                self._fh.close()
+            self._fh = self._mm = None
+
+    # ------------------------------------------------------------------
+    # Public lookup
+    # ------------------------------------------------------------------
+    def get(self, app_ids) -> dict:
+        """Return {app_id: {"name", "type", "icon", "clienticon", "categories"}}
+        for every requested app that Steam has cached locally. categories is a
+        set of Steam category IDs (22 = Steam Achievements)."""
+        with self._lock:
+            try:
+                self._map()
+            except (OSError, ValueError, struct.error) as e:
+                print(f"[AppInfo] Cannot read {self.path}: {e}")
+                return {}
+            try:
+                if self._offsets is None:
+                    self._offsets = self._build_offsets()
+                out = {}
+                for app_id in app_ids:
+                    app_id = str(app_id)
+                    if app_id in self._results:
+                        out[app_id] = self._results[app_id]
+                        continue
+                    span = self._offsets.get(int(app_id)) if app_id.isdigit() else None
+                    if span is None:
+                        continue
+                    try:
+                        info = self._read_common(*span)
+                    except (IndexError, ValueError, struct.error) as e:
+                        print(f"[AppInfo] Could not decode app {app_id}: {e}")
+                        continue
+                    self._results[app_id] = out[app_id] = info
+                return out
+            finally:
+                self.close()
+
+    # ------------------------------------------------------------------
+    # File layout
+    # ------------------------------------------------------------------
+    def _build_offsets(self) -> dict:
+        mm = self._mm
+        pos = 8
+        if self.version >= 29:
+            pos += 8   # int64 offset of the key string table
+        # Per-entry header after the size field: info_state, last_updated,
+        # pics_token, sha1, change_number (+ binary sha1 from v28 on)
+        header = 4 + 4 + 8 + 20 + 4 + (20 if self.version >= 28 else 0)
+        offsets = {}
+        limit = len(mm)
+        while pos + 8 <= limit:
+            app_id, size = struct.unpack_from("<II", mm, pos)
+            if app_id == 0:
+                break
+            end = pos + 8 + size
+            offsets[app_id] = (pos + 8 + header, end)
+            pos = end
+        return offsets
+
+    def _string_table(self) -> list:
+        if self._strings is None:
+            (table_offset,) = struct.unpack_from("<q", self._mm, 8)
+            (count,) = struct.unpack_from("<I", self._mm, table_offset)
+            raw = self._mm[table_offset + 4:]
+            self._strings = [s.decode("utf-8", "replace")
+                             for s in raw.split(b"\0", count)[:count]]
+        return self._strings
+
+    # ------------------------------------------------------------------
+    # Binary VDF walking
+    # ------------------------------------------------------------------
+    def _cstring(self, pos: int) -> tuple:
+        end = self._mm.find(b"\0", pos)
+        if end < 0:
+            raise ValueError("unterminated string")
+        return self._mm[pos:end].decode("utf-8", "replace"), end + 1
+
+    def _key(self, pos: int) -> tuple:
+        if self.version >= 29:
+            (idx,) = struct.unpack_from("<I", self._mm, pos)
+            return self._string_table()[idx], pos + 4
+        return self._cstring(pos)
+
+    def _skip_key(self, pos: int) -> int:
+        if self.version >= 29:
+            return pos + 4
+        end = self._mm.find(b"\0", pos)
+        if end < 0:
+            raise ValueError("unterminated key")
+        return end + 1
+
+    def _skip_value(self, kind: int, pos: int) -> int:
+        if kind == _BVDF_MAP:
+            return self._skip_map(pos)
+        if kind == _BVDF_STRING:
+            end = self._mm.find(b"\0", pos)
+            if end < 0:
+                raise ValueError("unterminated string")
+            return end + 1
+        if kind in _BVDF_FIXED_SIZE:
+            return pos + _BVDF_FIXED_SIZE[kind]
+        if kind == _BVDF_WSTRING:
+            while self._mm[pos:pos + 2] != b"\0\0":
+                pos += 2
+            return pos + 2
+        raise ValueError(f"unknown binary VDF type 0x{kind:02x}")
+
+    def _skip_map(self, pos: int) -> int:
+        """Skip the children of a map whose key has been consumed."""
+        mm = self._mm
+        while True:
+            kind = mm[pos]
+            pos += 1
+            if kind in (_BVDF_END, _BVDF_END_ALT):
+                return pos
+            pos = self._skip_value(kind, self._skip_key(pos))
+
+    def _enter(self, pos: int, end: int, name: str) -> int | None:
+        """Return the position of the first child of map `name` among the
+        children starting at pos, or None if it is not present."""
+        mm = self._mm
+        while pos < end:
+            kind = mm[pos]
+            pos += 1
+            if kind in (_BVDF_END, _BVDF_END_ALT):
+                return None
+            key, pos = self._key(pos)
+            if kind == _BVDF_MAP and key == name:
+                return pos
+            pos = self._skip_value(kind, pos)
+        return None
+
+    def _read_common(self, pos: int, end: int) -> dict:
+        info = {"name": "", "type": "", "icon": "", "clienticon": "", "categories": set()}
+        pos = self._enter(pos, end, "appinfo")
+        pos = self._enter(pos, end, "common") if pos is not None else None
+        if pos is None:
+            return info
+        mm = self._mm
+        while pos < end:
+            kind = mm[pos]
+            pos += 1
+            if kind in (_BVDF_END, _BVDF_END_ALT):
+                break
+            key, pos = self._key(pos)
+            if kind == _BVDF_STRING and key in self._COMMON_STRINGS:
+                info[key], pos = self._cstring(pos)
+            elif kind == _BVDF_MAP and key == "category":
+                # Children look like "category_22" → 1
+                while True:
+                    child = mm[pos]
+                    pos += 1
+                    if child in (_BVDF_END, _BVDF_END_ALT):
+                        break
+                    cat, pos = self._key(pos)
+                    pos = self._skip_value(child, pos)
+                    if cat.startswith("category_") and cat[9:].isdigit():
+                        info["categories"].add(int(cat[9:]))
+            else:
+                pos = self._skip_value(kind, pos)
+        return info
+
+
+def is_non_game_type(app_type: str) -> bool:
+    """True for appinfo types that should never be spun (tools, DLC, media…)."""
+    return app_type.lower() in NON_GAME_APP_TYPES
+
+
+# ---------------------------------------------------------------------------
+# Non-Steam shortcuts (userdata/<id>/config/shortcuts.vdf)
+# ---------------------------------------------------------------------------
+_shortcut_cache_lock = threading.Lock()
+
+
+def parse_binary_vdf(data: bytes, pos: int = 0) -> dict:
+    """Decode a small binary VDF document (e.g. shortcuts.vdf) into dicts."""
+    def _cstr(p):
+        end = data.index(b"\0", p)
+        return data[p:end].decode("utf-8", "replace"), end + 1
+
+    def _map(p):
+        out = {}
+        while True:
+            kind = data[p]
+            p += 1
+            if kind in (_BVDF_END, _BVDF_END_ALT):
+                return out, p
+            key, p = _cstr(p)
+            if kind == _BVDF_MAP:
+                out[key], p = _map(p)
+            elif kind == _BVDF_STRING:
+                out[key], p = _cstr(p)
+            elif kind == _BVDF_INT32:
+                (out[key],) = struct.unpack_from("<i", data, p)
+                p += 4
+            elif kind == _BVDF_FLOAT32:
+                (out[key],) = struct.unpack_from("<f", data, p)
+                p += 4
+            elif kind in (_BVDF_POINTER, _BVDF_COLOR):
+                (out[key],) = struct.unpack_from("<I", data, p)
+                p += 4
+            elif kind == _BVDF_UINT64:
+                (out[key],) = struct.unpack_from("<Q", data, p)
+                p += 8
+            elif kind == _BVDF_INT64:
+                (out[key],) = struct.unpack_from("<q", data, p)
+                p += 8
+            else:
+                raise ValueError(f"unsupported binary VDF type 0x{kind:02x}")
+
+    try:
+        return _map(pos)[0]
+    except IndexError:
+        raise ValueError("truncated binary VDF data") from None
+
+
+def shortcut_game_id(entry: dict) -> tuple:
+    """Return (32-bit shortcut app id, 64-bit rungameid) for a shortcuts.vdf entry.
+
+    Current Steam clients store the id in "appid"; older files only have the
+    exe and name, from which Steam derives it with a CRC32.
+    """
+    app_id = entry.get("appid") or entry.get("AppID")
+    if isinstance(app_id, int) and app_id:
+        top = app_id & 0xFFFFFFFF
+    else:
+        exe = entry.get("Exe") or entry.get("exe") or ""
+        name = entry.get("AppName") or entry.get("appname") or ""
+        top = zlib.crc32((exe + name).encode("utf-8")) | 0x80000000
+    return top, (top << 32) | 0x02000000
+
+
+def _shortcut_grid_image(grid_dir: str, short_id: int, game_id: int) -> str:
+    """The horizontal grid capsule Steam shows for a shortcut, if the user set one."""
+    for stem in (str(short_id), str(game_id)):
+        for ext in (".png", ".jpg", ".jpeg"):
+            path = os.path.join(grid_dir, stem + ext)
+            if os.path.isfile(path):
+                return path
+    return ""
+
+
+def read_shortcuts_file(path: str) -> list:
+    """Return game records for every shortcut in one shortcuts.vdf file."""
+    with open(path, "rb") as fh:
+        doc = parse_binary_vdf(fh.read())
+    grid_dir = os.path.join(os.path.dirname(path), "grid")
+    games = []
+    for entry in (doc.get("shortcuts") or doc.get("Shortcuts") or {}).values():
+        if not isinstance(entry, dict):
+            continue
+        name = (entry.get("AppName") or entry.get("appname") or "").strip()
+        if not name:
+            continue
+        short_id, game_id = shortcut_game_id(entry)
+        games.append({
+            "app_id": str(game_id),
+            "name": name,
+            "path": (entry.get("StartDir") or "").strip('"'),
+            "shortcut": True,
+            "launch_url": f"steam://rungameid/{game_id}",
+            "header_path": _shortcut_grid_image(grid_dir, short_id, game_id),
+            "icon_path": (entry.get("icon") or "").strip('"'),
+        })
+    return games
+
+
+def get_shortcut_games(steam_path: str, cache_file: str | None = None) -> list:
+    """Non-Steam shortcuts for every Steam user on this machine.
+
+    Parsed results are cached in cache_file keyed by each shortcuts.vdf's
+    (mtime, size) together with its grid folder's, so an unchanged file is
+    never re-read but art added to or removed from config/grid is noticed.
+    """
+    userdata = os.path.join(steam_path, "userdata")
+    try:
+        user_dirs = sorted(d for d in os.listdir(userdata) if d.isdigit())
+    except OSError:
+        return []
+
+    with _shortcut_cache_lock:
+        cache: dict = {}
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, "r") as fh:
+                    cache = json.load(fh)
+            except Exception as e:
+                print(f"[Shortcuts] Ignoring unreadable cache: {e}")
+
+        games, seen_ids, fresh, changed = [], set(), {}, False
+        for user in user_dirs:
+            path = os.path.join(userdata, user, "config", "shortcuts.vdf")
+            stat = _stat_key(path)
+            if stat is None:
+                continue
+            stat.append(_stat_key(os.path.join(os.path.dirname(path), "grid")))
+            entry = cache.get(path)
+            if entry and entry.get("stat") == stat:
+                records = entry["games"]
+            else:
+                try:
+                    records = read_shortcuts_file(path)
+                except (OSError, ValueError) as e:
+                    print(f"[Shortcuts] Could not read {path}: {e}")
+                    continue
+                changed = True
+            fresh[path] = {"stat": stat, "games": records}
+            for game in records:
+                if game["app_id"] not in seen_ids:
+                    seen_ids.add(game["app_id"])
+                    games.append(dict(game))
+
+        if cache_file and (changed or fresh.keys() != cache.keys()):
+            try:
+                with open(cache_file, "w") as fh:
+                    json.dump(fresh, fh)
+            except Exception as e:
+                print(f"[Shortcuts] Could not save cache: {e}")
+
+    if games:
+        print(f"[Shortcuts] {len(games)} non-Steam shortcut(s) found.")
+    return games
+
+
 # ---------------------------------------------------------------------------
 # Image helpers
 # ---------------------------------------------------------------------------
-# Thread lock for preloaded_images dict mutations coming from background threads
-_image_lock = threading.Lock()
+class _CacheStripe:
+    """One lock-protected shard of an ImageCache."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.compressed: OrderedDict = OrderedDict()   # key → (bytes, mode)
+        self.decoded: OrderedDict = OrderedDict()      # key → (Image, nbytes)
+        self.compressed_bytes = 0
+        self.decoded_bytes = 0
+        self.hits = self.decoded_hits = self.misses = self.evictions = 0
+
+
+class ImageCache:
+    """Byte-budgeted, two-tier in-memory cache of header images.
+
+    Every image is kept as encoded bytes (the compressed tier, a few tens of
+    KB per header); the most recently used ones are also kept decoded. Both
+    tiers evict least-recently-used entries once over budget. Keys are
+    spread over `stripes` independently locked shards, each with an equal
+    share of the budgets, so worker threads rarely contend. Decoding and
+    encoding happen outside the locks.
+    """
+
+    def __init__(self, compressed_budget: int = IMAGE_CACHE_BUDGET_BYTES,
+                 decoded_budget: int = DECODED_CACHE_BUDGET_BYTES,
+                 stripes: int = IMAGE_CACHE_STRIPES):
+        self._stripes = [_CacheStripe() for _ in range(stripes)]
+        self._compressed_budget = compressed_budget // stripes
+        self._decoded_budget = decoded_budget // stripes
+
+    def _stripe(self, key: str) -> _CacheStripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    @staticmethod
+    def _encode(img: Image.Image) -> tuple:
+        buf = BytesIO()
+        if img.mode in ("RGBA", "LA", "P"):
+            img.save(buf, "PNG")
+        else:
+            img.convert("RGB").save(buf, "JPEG", quality=90)
+        return buf.getvalue(), img.mode
+
+    @staticmethod
+    def _decoded_size(img: Image.Image) -> int:
+        return img.width * img.height * len(img.getbands())
+
+    def _evict(self, stripe: _CacheStripe) -> None:
+        # Caller holds stripe.lock
+        while stripe.decoded_bytes > self._decoded_budget and stripe.decoded:
+            _, (_, nbytes) = stripe.decoded.popitem(last=False)
+            stripe.decoded_bytes -= nbytes
+            stripe.evictions += 1
+        while stripe.compressed_bytes > self._compressed_budget and stripe.compressed:
+            key, (data, _) = stripe.compressed.popitem(last=False)
+            stripe.compressed_bytes -= len(data)
+            stripe.evictions += 1
+            entry = stripe.decoded.pop(key, None)
+            if entry is not None:
+                stripe.decoded_bytes -= entry[1]
+
+    def _keep_decoded(self, stripe: _CacheStripe, key: str, img: Image.Image) -> None:
+        # Caller holds stripe.lock
+        old = stripe.decoded.pop(key, None)
+        if old is not None:
+            stripe.decoded_bytes -= old[1]
+        nbytes = self._decoded_size(img)
+        stripe.decoded[key] = (img, nbytes)
+        stripe.decoded_bytes += nbytes
+
+    def get(self, key: str) -> Image.Image | None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.decoded.get(key)
+            if entry is not None:
+                stripe.decoded.move_to_end(key)
+                stripe.compressed.move_to_end(key)
+                stripe.hits += 1
+                stripe.decoded_hits += 1
+                return entry[0]
+            packed = stripe.compressed.get(key)
+            if packed is None:
+                stripe.misses += 1
+                return None
+            stripe.compressed.move_to_end(key)
+            stripe.hits += 1
+        data, mode = packed
+        img = Image.open(BytesIO(data))
+        img.load()
+        if mode is not None and img.mode != mode:
+            img = img.convert(mode)
+        with stripe.lock:
+            if key in stripe.compressed:
+                self._keep_decoded(stripe, key, img)
+                self._evict(stripe)
+        return img
+
+    def put(self, key: str, img: Image.Image, data: bytes | None = None) -> None:
+        """Cache img; pass its encoded file bytes as `data` to skip re-encoding."""
+        self._insert(key, (data, img.mode) if data else self._encode(img), img)
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        """Cache an encoded image file as-is, in the compressed tier only;
+        get() decodes it the first time it is asked for."""
+        self._insert(key, (data, None), None)
+
+    def _insert(self, key: str, packed: tuple, img: Image.Image | None) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            old = stripe.compressed.pop(key, None)
+            if old is not None:
+                stripe.compressed_bytes -= len(old[0])
+            stripe.compressed[key] = packed
+            stripe.compressed_bytes += len(packed[0])
+            if img is not None:
+                self._keep_decoded(stripe, key, img)
+            else:
+                stale = stripe.decoded.pop(key, None)
+                if stale is not None:
+                    stripe.decoded_bytes -= stale[1]
+            self._evict(stripe)
+
+    def pop(self, key: str) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            old = stripe.compressed.pop(key, None)
+            if old is not None:
+                stripe.compressed_bytes -= len(old[0])
+            entry = stripe.decoded.pop(key, None)
+            if entry is not None:
+                stripe.decoded_bytes -= entry[1]
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.compressed.clear()
+                stripe.decoded.clear()
+                stripe.compressed_bytes = stripe.decoded_bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            return key in stripe.compressed
+
+    def stats(self) -> dict:
+        totals = dict.fromkeys(("entries", "decoded_entries", "compressed_bytes",
+                                "decoded_bytes", "hits", "decoded_hits", "misses",
+                                "evictions"), 0)
+        for stripe in self._stripes:
+            with stripe.lock:
+                totals["entries"] += len(stripe.compressed)
+                totals["decoded_entries"] += len(stripe.decoded)
+                totals["compressed_bytes"] += stripe.compressed_bytes
+                totals["decoded_bytes"] += stripe.decoded_bytes
+                totals["hits"] += stripe.hits
+                totals["decoded_hits"] += stripe.decoded_hits
+                totals["misses"] += stripe.misses
+                totals["evictions"] += stripe.evictions
+        return totals
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"{s['entries']} image(s) in {s['compressed_bytes'] / 2**20:.1f} MB "
+                f"({s['decoded_entries']} decoded, {s['decoded_bytes'] / 2**20:.1f} MB); "
+                f"{s['hits']} hit(s) ({s['decoded_hits']} decoded), {s['misses']} miss(es), "
+                f"{s['evictions']} eviction(s)")
 
 
 def create_placeholder_image(text: str) -> Image.Image:
@@ -213,77 +1714,288 @@ def create_placeholder_icon(size: int = 20) -> Image.Image:
     return img
 
 
-def fetch_header_image(app_id: str, cache_dir: str, timeout: int = 10,
-                       game_name: str = "") -> Image.Image:
-    """Fetch game header image from disk cache or Steam CDN."""
-    label = f"{game_name} ({app_id})" if game_name else app_id
-    cache_file = os.path.join(cache_dir, f"{app_id}.jpg")
-    if os.path.exists(cache_file):
-        try:
-            img = Image.open(cache_file)
-            img.load()
-            return img
-        except Exception as e:
-            print(f"[Image] Corrupt cache for {label} — deleting and re-fetching. ({e})")
-            try:
-                os.remove(cache_file)
-            except OSError:
-                pass
+# Where each header image came from: our cache, a shortcut's local art,
+# Steam's own librarycache, the CDN, or nothing (placeholder)
+image_source_hits = {"cache": 0, "local": 0, "steam": 0, "network": 0, "placeholder": 0}
+_image_source_lock = threading.Lock()
 
-    urls = [
+
+def _count_image_source(tier: str) -> None:
+    with _image_source_lock:
+        image_source_hits[tier] += 1
+
+
+def image_source_summary() -> str:
+    with _image_source_lock:
+        return ", ".join(f"{tier} {n}" for tier, n in image_source_hits.items())
+
+
+def image_format(head: bytes) -> str | None:
+    """The image format named by a file's leading bytes, or None if they are
+    not a format we can display."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    if head.startswith(b"BM"):
+        return "BMP"
+    if head.startswith(b"\x00\x00\x01\x00"):
+        return "ICO"
+    return None
+
+
+def is_image_file(path: str) -> bool:
+    """Whether path starts like an image we can display (False if unreadable)."""
+    try:
+        with open(path, "rb") as f:
+            return image_format(f.read(16)) is not None
+    except OSError:
+        return False
+
+
+def store_image_file(source_path: str, dest: str) -> bool:
+    """Copy an image file's bytes unchanged to dest, atomically (temp file +
+    rename), if its header says it is an image. Returns False otherwise."""
+    with open(source_path, "rb") as src:
+        if image_format(src.read(16)) is None:
+            return False
+        src.seek(0)
+        tmp_path = f"{dest}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as out:
+                shutil.copyfileobj(src, out)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+    return True
+
+
+def find_steam_library_image(steam_path: str | None, app_id: str,
+                             filename: str = "header.jpg") -> str:
+    """Path of an image in Steam's appcache/librarycache, or "" if absent.
+
+    Handles the flat layout (<appid>_header.jpg) as well as the per-app folder
+    layout (<appid>/header.jpg, optionally one hashed sub-folder deeper).
+    """
+    if not steam_path or not str(app_id).isdigit():
+        return ""
+    library_cache = os.path.join(steam_path, "appcache", "librarycache")
+    stem, ext = os.path.splitext(filename)
+    app_dir = os.path.join(library_cache, str(app_id))
+    flat = os.path.join(library_cache, f"{app_id}_{stem}{ext}")
+    if os.path.isfile(flat):
+        return flat
+    direct = os.path.join(app_dir, filename)
+    if os.path.isfile(direct):
+        return direct
+    try:
+        with os.scandir(app_dir) as it:
+            for entry in it:
+                if entry.is_dir():
+                    nested = os.path.join(entry.path, filename)
+                    if os.path.isfile(nested):
+                        return nested
+    except OSError:
+        pass
+    return ""
+
+
+def header_urls(app_id: str) -> list:
+    """CDN URLs for a game's header art, best first."""
+    return [
         f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/header.jpg",
         f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/header.jpg",
         f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/capsule_616x353.jpg",
         f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/page_bg.jpg",
     ]
-    for url in urls:
-        try:
-            resp = _session.get(url, timeout=timeout)
-            if resp.status_code == 200 and len(resp.content) > 1024:
-                img = Image.open(BytesIO(resp.content))
-                img.load()
-                img.save(cache_file, "JPEG")
-                print(f"[Image] Downloaded: {label}")
-                return img
-            elif resp.status_code != 200:
-                print(f"[Image] HTTP {resp.status_code} for {label} — {url}")
-        except Exception as e:
-            print(f"[Image] Error fetching {label} from {url}: {e}")
 
-    print(f"[Image] All URLs failed for {label} — using placeholder.")
-    return create_placeholder_image("Image Unavailable")
 
+def icon_urls(app_id: str, icon_hash: str = "") -> list:
+    """URLs for a game's small icon, best first."""
+    urls = [
+        f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/capsule_sm_120.jpg",
+        f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/capsule_sm_120.jpg",
+    ]
+    if icon_hash:
+        base = (f"https://media.steampowered.com/steamcommunity/public"
+                f"/images/apps/{app_id}/{icon_hash}")
+        urls += [base, f"{base}.jpg", f"{base}.png"]
+    return urls
 
-def fetch_game_icon(app_id: str, icon_hash: str, cache_dir: str,
-                    size: int = 20, timeout: int = 6,
-                    game_name: str = "") -> "Image.Image | None":
-    """Fetch a small icon for a game as a PIL Image, scaled to size px.
-    Returns a PIL Image (not PhotoImage) so it can be used from background threads.
+
+def derived_image(source_path: str, cache_dir: str, key: str, size: tuple,
+                  resample: str = "lanczos", fmt: str = "JPEG",
+                  source=None) -> Image.Image:
+    """source_path scaled to size, through the on-disk rendition cache.
+
+    Renditions are stored under <cache_dir>/derived/ keyed by (key, size,
+    resample) and stamped with their source's mtime; one whose stamp no longer
+    matches the source is rebuilt. Pass `source` (the decoded original, or a
+    callable returning it or None) to skip reading the file again on a miss;
+    a callable is only called on a miss. Resizing is slow, so call this
+    from a worker thread, never the Tk main thread.
+    """
+    width, height = size
+    src_stat = os.stat(source_path)
+    ext = ".png" if fmt == "PNG" else ".jpg"
+    derived_dir = os.path.join(cache_dir, DERIVED_CACHE_SUBDIR)
+    derived_path = os.path.join(derived_dir, f"{key}_{width}x{height}_{resample}{ext}")
+    try:
+        if os.stat(derived_path).st_mtime_ns == src_stat.st_mtime_ns:
+            img = Image.open(derived_path)
+            img.load()
+            return img
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[Image] Rebuilding unreadable rendition {os.path.basename(derived_path)}: {e}")
+
+    if callable(source):
+        source = source()
+    if source is None:
+        source = Image.open(source_path)
+        source.load()
+    scaled = source.convert("RGBA" if fmt == "PNG" else "RGB").resize(
+        (width, height), getattr(Image.Resampling, resample.upper()))
+    try:
+        os.makedirs(derived_dir, exist_ok=True)
+        tmp_path = f"{derived_path}.{threading.get_ident()}.tmp"
+        scaled.save(tmp_path, fmt, **({"quality": 95} if fmt == "JPEG" else {}))
+        os.utime(tmp_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.replace(tmp_path, derived_path)
+    except OSError as e:
+        print(f"[Image] Could not store rendition {os.path.basename(derived_path)}: {e}")
+    return scaled
+
+
+def stage_header_file(app_id: str, cache_dir: str, label: str = "",
+                      local_path: str = "", steam_path: str | None = None) -> str | None:
+    """Put the best local copy of a header in image_cache without decoding
+    it: local_path (a shortcut's grid art) when newer than the cached file,
+    else the cached file, else Steam's librarycache copy. Returns the tier
+    that supplied {app_id}.jpg ("local", "cache" or "steam"), or None."""
+    cache_file = os.path.join(cache_dir, f"{app_id}.jpg")
+    if local_path and os.path.isfile(local_path):
+        try:
+            if ((not os.path.exists(cache_file)
+                    or os.path.getmtime(local_path) > os.path.getmtime(cache_file))
+                    and store_image_file(local_path, cache_file)):
+                print(f"[Image] Cached local art for {label or app_id}")
+                return "local"
+        except Exception as e:
+            print(f"[Image] Could not read local art for {label or app_id}: {e}")
+    if os.path.exists(cache_file):
+        return "cache"
+    steam_file = find_steam_library_image(steam_path, app_id)
+    if steam_file:
+        try:
+            if store_image_file(steam_file, cache_file):
+                return "steam"
+            print(f"[Image] Steam library image for {label or app_id} is not an image file.")
+        except Exception as e:
+            print(f"[Image] Unreadable Steam library image for {label or app_id}: {e}")
+    return None
+
+
+def fetch_header_image(app_id: str, cache_dir: str, timeout: int = 10,
+                       game_name: str = "", local_path: str = "",
+                       allow_network: bool = True,
+                       steam_path: str | None = None) -> Image.Image:
+    """Fetch a game header image, trying each source tier in turn:
+
+    1. our image_cache (local_path, e.g. a shortcut's grid art, is copied in
+       first whenever it is newer than the cached file),
+    2. Steam's own appcache/librarycache under steam_path,
+    3. the Steam CDN — skipped when allow_network is False.
+
+    Files enter the cache byte-for-byte (never re-encoded) and atomically,
+    so {app_id}.jpg may hold PNG or other formats; Pillow goes by content.
+    Hits per tier are counted in image_source_hits.
+    """
+    label = f"{game_name} ({app_id})" if game_name else app_id
+    cache_file = os.path.join(cache_dir, f"{app_id}.jpg")
+    tier = stage_header_file(app_id, cache_dir, label, local_path, steam_path)
+    if tier is not None:
+        try:
+            img = Image.open(cache_file)
+            img.load()
+            _count_image_source(tier)
+            return img
+        except Exception as e:
+            print(f"[Image] Corrupt cache for {label} — deleting and re-fetching. ({e})")
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
+
+    if not allow_network:
+        _count_image_source("placeholder")
+        return create_placeholder_image("Image Unavailable")
+
+    if _downloader().fetch(header_urls(app_id), cache_file, min_size=1025,
+                           timeout=timeout, label=label, app_id=app_id,
+                           negative=negative_cache(),
+                           ranking=url_ranking()).result():
+        try:
+            img = Image.open(cache_file)
+            img.load()
+            print(f"[Image] Downloaded: {label}")
+            _count_image_source("network")
+            return img
+        except Exception as e:
+            print(f"[Image] Downloaded file for {label} is not an image ({e}).")
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
+
+    print(f"[Image] All URLs failed for {label} — using placeholder.")
+    _count_image_source("placeholder")
+    return create_placeholder_image("Image Unavailable")
+
+
+def fetch_game_icon(app_id: str, icon_hash: str, cache_dir: str,
+                    size: int = 20, timeout: int = 6,
+                    game_name: str = "", local_path: str = "",
+                    allow_network: bool = True) -> "Image.Image | None":
+    """Fetch a small icon for a game as a PIL Image, scaled to size px.
+    Returns a PIL Image (not PhotoImage) so it can be used from background threads.
     Caller must convert to PhotoImage on the main thread.
-    Always cached as PNG to support RGBA icons."""
+    The downloaded file is kept as served (icon_{app_id}.png may hold a JPEG);
+    scaled renditions are stored as PNG to support RGBA icons.
+    local_path (a shortcut's icon file) is tried before the CDN; with
+    allow_network=False the CDN is skipped entirely."""
     if not app_id:
         return None
 
     label = f"{game_name} ({app_id})" if game_name else app_id
+    if local_path and os.path.isfile(local_path):
+        try:
+            return derived_image(local_path, cache_dir, f"icon_{app_id}", (size, size),
+                                 fmt="PNG")
+        except Exception:
+            pass   # often an .exe — fall through to the cache/placeholder
     cache_file = os.path.join(cache_dir, f"icon_{app_id}.png")
 
-    # Migrate legacy .jpg cache
+    # Migrate legacy .jpg cache (by name only: Pillow reads the bytes by content)
     legacy_cache = os.path.join(cache_dir, f"icon_{app_id}.jpg")
     if os.path.exists(legacy_cache) and not os.path.exists(cache_file):
         try:
-            img = Image.open(legacy_cache).convert("RGBA")
-            img.load()
-            img.save(cache_file, "PNG")
-            os.remove(legacy_cache)
+            os.replace(legacy_cache, cache_file)
             print(f"[Icon] Migrated legacy .jpg cache for {label}")
         except Exception as e:
             print(f"[Icon] Failed to migrate legacy cache for {label}: {e}")
 
     if os.path.exists(cache_file):
         try:
-            img = Image.open(cache_file).convert("RGBA")
-            img.load()
-            return img.resize((size, size), Image.Resampling.LANCZOS)
+            return derived_image(cache_file, cache_dir, f"icon_{app_id}", (size, size),
+                                 fmt="PNG")
         except Exception as e:
             print(f"[Icon] Corrupt cache for {label} — deleting and re-fetching. ({e})")
             try:
@@ -291,101 +2003,1782 @@ def fetch_game_icon(app_id: str, icon_hash: str, cache_dir: str,
             except OSError:
                 pass
 
-    urls = [
-        f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/capsule_sm_120.jpg",
-        f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/capsule_sm_120.jpg",
-    ]
-    if icon_hash:
-        base = (f"https://media.steampowered.com/steamcommunity/public"
-                f"/images/apps/{app_id}/{icon_hash}")
-        urls += [base, f"{base}.jpg", f"{base}.png"]
+    if not allow_network:
+        return create_placeholder_icon(size)
 
-    tried = []
-    for url in urls:
+    if _downloader().fetch(icon_urls(app_id, icon_hash), cache_file, min_size=65,
+                           timeout=timeout, label=label, app_id=app_id,
+                           negative=negative_cache(),
+                           ranking=url_ranking()).result():
         try:
-            resp = _session.get(url, timeout=timeout)
-            if resp.status_code == 200 and len(resp.content) > 64:
-                img = Image.open(BytesIO(resp.content)).convert("RGBA")
-                img.load()
-                img.save(cache_file, "PNG")
-                print(f"[Icon] Downloaded: {label}")
-                return img.resize((size, size), Image.Resampling.LANCZOS)
-            elif resp.status_code == 404:
-                tried.append(os.path.basename(url.split("?")[0]))
-            else:
-                print(f"[Icon] HTTP {resp.status_code} for {label} — {url}")
+            img = derived_image(cache_file, cache_dir, f"icon_{app_id}", (size, size), fmt="PNG")
+            print(f"[Icon] Downloaded: {label}")
+            return img
         except Exception as e:
-            print(f"[Icon] Error fetching {label} from {url}: {e}")
+            print(f"[Icon] Downloaded file for {label} is not an image ({e}).")
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
 
-    if tried:
-        print(f"[Icon] No icon found for {label} "
-              f"(404 on: {', '.join(tried)}) — using placeholder.")
-    else:
-        print(f"[Icon] All URLs failed for {label} — using placeholder.")
+    print(f"[Icon] No icon found for {label} — using placeholder.")
     return create_placeholder_icon(size)
 
 
+class IconAtlas:
+    """Every scaled exclude-list icon packed into one memory-mapped file.
+
+    <base>.bin holds fixed-size slots of raw RGBA pixels (size × size × 4
+    bytes); <base>.json maps app_id → [slot, stamp], where stamp is the
+    mtime_ns of a shortcut's local icon file (0 for downloaded icons, which
+    are dropped from the atlas instead when they change). Looking up an icon
+    is a dict lookup plus a copy out of the map, with no per-icon file open,
+    decode or resize. New icons are written to their slot straight away;
+    save() writes the index.
+    """
+
+    def __init__(self, base_path: str, size: int = ICON_SIZE):
+        self.base_path = base_path
+        self.size = size
+        self.slot_bytes = size * size * 4
+        self._lock = threading.Lock()
+        self._slots: dict = {}    # app_id → [slot, stamp]
+        self._free: list = []     # slots of discarded icons, reused first
+        self._count = 0           # slots in the .bin file
+        self._dirty = False
+        self._mm = None
+        try:
+            with open(base_path + ".json", "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("size") == size:
+                self._slots = index.get("slots", {})
+                self._free = index.get("free", [])
+        except (OSError, ValueError, AttributeError):
+            pass
+        try:
+            self._fh = open(base_path + ".bin", "r+b" if os.path.exists(base_path + ".bin") else "w+b")
+        except OSError as e:
+            print(f"[Icon] Could not open the icon atlas ({e}) — decoding icons one by one.")
+            self._fh = None
+            self._slots = {}
+            return
+        self._count = os.fstat(self._fh.fileno()).st_size // self.slot_bytes
+        stale = [app_id for app_id, (slot, _stamp) in self._slots.items() if slot >= self._count]
+        for app_id in stale:
+            del self._slots[app_id]
+        self._free = [slot for slot in self._free if slot < self._count]
+        self._remap()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _remap(self) -> None:
+        # Caller holds the lock (or is __init__)
+        import mmap
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._count:
+            self._mm = mmap.mmap(self._fh.fileno(), self._count * self.slot_bytes,
+                                 access=mmap.ACCESS_READ)
+
+    def get(self, app_id: str, stamp: int = 0) -> "Image.Image | None":
+        """The packed icon for app_id, or None if absent or its stamp differs."""
+        with self._lock:
+            entry = self._slots.get(str(app_id))
+            if entry is None or entry[1] != stamp or self._mm is None:
+                return None
+            start = entry[0] * self.slot_bytes
+            pixels = self._mm[start:start + self.slot_bytes]
+        return Image.frombytes("RGBA", (self.size, self.size), pixels)
+
+    def put(self, app_id: str, img: "Image.Image", stamp: int = 0) -> None:
+        """Store img (scaled to the atlas size if needed) in app_id's slot."""
+        if self._fh is None:
+            return
+        if img.size != (self.size, self.size):
+            img = img.resize((self.size, self.size), Image.Resampling.LANCZOS)
+        pixels = img.convert("RGBA").tobytes()
+        with self._lock:
+            entry = self._slots.get(str(app_id))
+            if entry is not None:
+                slot = entry[0]
+            elif self._free:
+                slot = self._free.pop()
+            else:
+                slot = self._count
+            try:
+                self._fh.seek(slot * self.slot_bytes)
+                self._fh.write(pixels)
+                self._fh.flush()
+            except OSError as e:
+                print(f"[Icon] Could not write to the icon atlas: {e}")
+                return
+            self._slots[str(app_id)] = [slot, stamp]
+            self._dirty = True
+            if slot >= self._count:
+                self._count = slot + 1
+                self._remap()
+
+    def discard(self, app_id: str) -> None:
+        with self._lock:
+            entry = self._slots.pop(str(app_id), None)
+            if entry is not None:
+                self._free.append(entry[0])
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write the index if any slot changed since the last save."""
+        with self._lock:
+            if not self._dirty or self._fh is None:
+                return
+            index = {"size": self.size, "slots": dict(self._slots), "free": list(self._free)}
+            self._dirty = False
+        tmp = self.base_path + ".json.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp, self.base_path + ".json")
+        except OSError as e:
+            print(f"[Icon] Could not save the icon atlas index: {e}")
+
+
 # ---------------------------------------------------------------------------
 # Steam Web API helpers
 # ---------------------------------------------------------------------------
-def get_all_games(api_key: str, steam_id: str) -> list:
-    """Fetch all games owned by the user via the Steam API."""
-    url = "http://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
-    params = {
-        "key": api_key,
-        "steamid": steam_id,
-        "include_appinfo": True,
-        "include_played_free_games": True,
-    }
+API_OK = "ok"
+API_UNSUPPORTED = "unsupported"   # a definite no for this request: HTTP 400
+API_FAILED = "failed"             # anything else: network, other 4xx, 5xx after retries
+
+
+class ApiResult:
+    """Outcome of one Web API call.
+
+    status is API_OK (data holds the decoded JSON), API_UNSUPPORTED (a 400:
+    the API refused this request for good, e.g. an app without stats; safe
+    to remember) or API_FAILED (worth asking again later; never cache it as
+    a negative answer). A 401/403 (bad key, private profile) is a failure:
+    it says nothing about the app. http_status and error say what happened.
+    """
+
+    __slots__ = ("status", "data", "http_status", "error")
+
+    def __init__(self, status: str, data=None, http_status: int = 0, error: str = ""):
+        self.status = status
+        self.data = data
+        self.http_status = http_status
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == API_OK
+
+    def __repr__(self) -> str:
+        return f"ApiResult({self.status}, http={self.http_status}, error={self.error!r})"
+
+
+class SteamApi:
+    """The one client for api.steampowered.com.
+
+    Requests from every thread share a token bucket (API_RATE_PER_S,
+    API_BURST), so bursts from the achievement workers are smoothed out
+    instead of tripping Steam's rate limit. A 429, 5xx or network failure is
+    retried up to API_RETRIES times with jittered exponential backoff
+    (honouring Retry-After); other 4xx answers are final. Latency, retries
+    and errors are counted per endpoint; see stats() / summary().
+    """
+
+    BASE_URL = "https://api.steampowered.com/"
+
+    def __init__(self, rate: float = API_RATE_PER_S, burst: int = API_BURST,
+                 retries: int = API_RETRIES, timeout: float = API_TIMEOUT_S):
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._stats: dict = {}   # endpoint → counters
+
+    def _take_token(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+                self._refilled = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def _count(self, endpoint: str, field: str, seconds: float = 0.0) -> None:
+        with self._lock:
+            st = self._stats.setdefault(endpoint, {"calls": 0, "ok": 0, "unsupported": 0,
+                                                   "failed": 0, "retries": 0,
+                                                   "seconds": 0.0, "max_seconds": 0.0})
+            st[field] += 1
+            if field == "calls":
+                st["seconds"] += seconds
+                st["max_seconds"] = max(st["max_seconds"], seconds)
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), API_BACKOFF_MAX_S)
+        return min(API_BACKOFF_S * 2 ** attempt, API_BACKOFF_MAX_S) * random.uniform(0.5, 1.5)
+
+    def call(self, endpoint: str, params: dict) -> ApiResult:
+        """GET <BASE_URL><endpoint>/ (e.g. "IPlayerService/GetOwnedGames/v1")."""
+        url = f"{self.BASE_URL}{endpoint}/"
+        name = endpoint.split("/")[1] if "/" in endpoint else endpoint
+        for attempt in range(self.retries + 1):
+            self._take_token()
+            started = time.perf_counter()
+            retry_after = None
+            try:
+                resp = _http().get(url, params=params, timeout=self.timeout)
+                http_status = resp.status_code
+                error = f"HTTP {http_status}"
+                retry_after = resp.headers.get("Retry-After")
+            except Exception as e:   # connection error, timeout, …
+                http_status = 0
+                error = str(e) or type(e).__name__
+            self._count(name, "calls", time.perf_counter() - started)
+            if http_status == 200:
+                try:
+                    data = resp.json()
+                except ValueError as e:
+                    self._count(name, API_FAILED)
+                    return ApiResult(API_FAILED, http_status=200, error=f"bad JSON: {e}")
+                self._count(name, API_OK)
+                return ApiResult(API_OK, data, 200)
+            if http_status == 400:
+                self._count(name, API_UNSUPPORTED)
+                return ApiResult(API_UNSUPPORTED, http_status=http_status, error=error)
+            if 400 < http_status < 500 and http_status != 429:
+                if http_status in (401, 403):
+                    error += " (check the API key and that the profile's game details are public)"
+                self._count(name, API_FAILED)
+                return ApiResult(API_FAILED, http_status=http_status, error=error)
+            if attempt < self.retries:
+                self._count(name, "retries")
+                time.sleep(self._backoff(attempt, retry_after))
+        self._count(name, API_FAILED)
+        return ApiResult(API_FAILED, http_status=http_status, error=error)
+
+    def stats(self) -> dict:
+        """endpoint → {calls, ok, unsupported, failed, retries, avg_ms, max_ms}."""
+        with self._lock:
+            return {name: {**{k: v for k, v in st.items() if "seconds" not in k},
+                           "avg_ms": round(st["seconds"] / st["calls"] * 1000) if st["calls"] else 0,
+                           "max_ms": round(st["max_seconds"] * 1000)}
+                    for name, st in self._stats.items()}
+
+    def summary(self) -> str:
+        return "; ".join(
+            f"{name}: {st['calls']} call(s), {st['ok']} ok, {st['unsupported']} unsupported, "
+            f"{st['failed']} failed, {st['retries']} retried, avg {st['avg_ms']} ms"
+            for name, st in self.stats().items()) or "no calls"
+
+
+_steam_api_instance = None
+_steam_api_lock = threading.Lock()
+
+
+def steam_api() -> SteamApi:
+    """The shared SteamApi client, created on first use."""
+    global _steam_api_instance
+    if _steam_api_instance is None:
+        with _steam_api_lock:
+            if _steam_api_instance is None:
+                _steam_api_instance = SteamApi()
+    return _steam_api_instance
+
+
+# The GetOwnedGames fields the app uses; everything else is dropped on arrival
+OWNED_GAME_FIELDS = ("appid", "name", "img_icon_url", "rtime_last_played",
+                     "has_community_visible_stats")
+
+
+def get_all_games(api_key: str, steam_id: str, app_ids: list | None = None) -> list:
+    """Fetch the games owned by the user via the Steam API, trimmed to
+    OWNED_GAME_FIELDS. With app_ids, only those games are asked for
+    (appids_filter, OWNED_FILTER_CHUNK ids per request) — a much smaller
+    answer than the whole library."""
+    if app_ids is None:
+        requests_params = [{
+            "key": api_key,
+            "steamid": steam_id,
+            "include_appinfo": True,
+            "include_played_free_games": True,
+        }]
+    else:
+        ids = [int(a) for a in app_ids if str(a).isdigit()]
+        requests_params = [{
+            "key": api_key,
+            "input_json": json.dumps({
+                "steamid": steam_id,
+                "include_appinfo": True,
+                "include_played_free_games": True,
+                "appids_filter": ids[i:i + OWNED_FILTER_CHUNK],
+            }, separators=(",", ":")),
+        } for i in range(0, len(ids), OWNED_FILTER_CHUNK)]
+    games = []
+    for params in requests_params:
+        result = steam_api().call("IPlayerService/GetOwnedGames/v1", params)
+        if not result.ok:
+            print(f"Error fetching games from Steam API: {result.error}")
+            return []
+        games += [{k: g[k] for k in OWNED_GAME_FIELDS if k in g}
+                  for g in (result.data.get("response") or {}).get("games") or []]
+    if games:
+        print(f"Fetched {len(games)} games from Steam API.")
+        return games
+    print("No games found in Steam API response.")
+    return []
+
+
+def get_uninstalled_games_from_api(api_key: str, steam_id: str, installed_games: list) -> list:
+    all_games = get_all_games(api_key, steam_id)
+    if not all_games:
+        return []
+    installed_ids = {str(g["app_id"]) for g in installed_games}
+    return [
+        {"app_id": str(g["appid"]), "name": g["name"]}
+        for g in all_games
+        if str(g["appid"]) not in installed_ids
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Drive enumeration
+# ---------------------------------------------------------------------------
+_drive_cache: dict = {}
+
+
+def drive_of(path: str) -> str:
+    """Drive letter (Windows) or mount point that holds path.
+
+    Resolved on demand from the game's own path and cached, instead of
+    enumerating every drive with df/mount at startup.
+    """
+    if not path:
+        return ""
+    drive = _drive_cache.get(path)
+    if drive is None:
+        drive = os.path.splitdrive(path)[0]
+        if drive:
+            drive += "\\"
+        else:
+            drive = os.path.abspath(path)
+            while not os.path.ismount(drive) and os.path.dirname(drive) != drive:
+                drive = os.path.dirname(drive)
+        _drive_cache[path] = drive
+    return drive
+
+
+# ---------------------------------------------------------------------------
+# Shared requests session (reuses TCP connections across all API/image calls)
+# ---------------------------------------------------------------------------
+_session = None
+_session_lock = threading.Lock()
+
+
+def _http():
+    """The shared requests.Session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update({"User-Agent": "SteamRoulette/1.0"})
+                # Room for every download thread's keep-alive connection
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=DOWNLOAD_WORKERS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+# ---------------------------------------------------------------------------
+# Async image downloader
+# ---------------------------------------------------------------------------
+def read_image_meta(path: str) -> dict | None:
+    """The validator sidecar of a downloaded image, or None if it has none."""
+    try:
+        with open(path + IMAGE_META_SUFFIX, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta, dict) and meta.get("url") else None
+
+
+def write_image_meta(path: str, meta: dict) -> None:
+    """Write path's sidecar: source url, min_size, ETag, Last-Modified and
+    fetched_at (epoch seconds of the last 200 or 304)."""
+    tmp = f"{path}{IMAGE_META_SUFFIX}.tmp"
     try:
-        resp = _session.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        if "response" in data and "games" in data["response"]:
-            games = data["response"]["games"]
-            print(f"Fetched {len(games)} games from Steam API.")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, path + IMAGE_META_SUFFIX)
+    except OSError as e:
+        print(f"[Download] Could not write metadata for {path}: {e}")
+
+
+class NegativeCache:
+    """Persistent record of image URLs that recently failed, so they are not
+    re-requested every session.
+
+    Rows are (url, app_id, variant, status, checked_at), where variant is the
+    URL's file name (header.jpg, capsule_sm_120.jpg, …) and status is the HTTP
+    status, or 0 for a timeout / connection error. A 404 or 410 (including a
+    body too small to be an image) is trusted for NEGATIVE_TTL_MISSING_S; any
+    other failure only for NEGATIVE_TTL_ERROR_S.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # url → (app_id, variant, status, checked_at)
+        self._rows = PersistedTable(
+            db_path, "missing_urls", ("url TEXT",),
+            ("app_id TEXT", "variant TEXT", "status INTEGER NOT NULL",
+             "checked_at REAL NOT NULL"),
+            "missing-image cache", "[Download]")
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def ttl(status: int) -> float:
+        return NEGATIVE_TTL_MISSING_S if status in (404, 410) else NEGATIVE_TTL_ERROR_S
+
+    def is_missing(self, url: str) -> bool:
+        """True if url failed recently enough that it should not be retried."""
+        with self._lock:
+            row = self._rows.rows.get(url)
+            if row is None:
+                return False
+            if time.time() - row[3] < self.ttl(row[2]):
+                self.skipped += 1
+                return True
+            self._rows.pop(url)
+            return False
+
+    def record(self, url: str, app_id: str, status: int) -> None:
+        """Remember that url failed with status (0 for a network error)."""
+        with self._lock:
+            self._rows.set(url, (str(app_id), url.rsplit("/", 1)[-1], status, time.time()))
+
+    def forget(self, url: str) -> None:
+        """url answered after all; drop any failure recorded for it."""
+        with self._lock:
+            self._rows.pop(url)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+    def save(self) -> None:
+        """Flush recorded and forgotten URLs to disk."""
+        with self._lock:
+            self._rows.save()
+
+
+_negative_cache: NegativeCache | None = None
+_negative_cache_lock = threading.Lock()
+
+
+def negative_cache() -> NegativeCache:
+    """The shared NegativeCache, opened on first use."""
+    global _negative_cache
+    if _negative_cache is None:
+        with _negative_cache_lock:
+            if _negative_cache is None:
+                _negative_cache = NegativeCache(_data_path(STATE_DB_FILE))
+    return _negative_cache
+
+
+class UrlRanking:
+    """Learned order in which to try an app's image URLs.
+
+    Remembers, per app, which URL variants (the file name: header.jpg,
+    capsule_616x353.jpg, capsule_sm_120.jpg, …) last downloaded successfully,
+    and a moving average of time-to-first-byte per host. order() puts an
+    app's known-good variants first and, among the mirrors of one variant,
+    the fastest host first; hosts never measured are tried early once so
+    they get measured.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # (app_id, variant) → (succeeded_at,)
+        self._successes = PersistedTable(
+            db_path, "app_variants", ("app_id TEXT NOT NULL", "variant TEXT NOT NULL"),
+            ("succeeded_at REAL NOT NULL",), "URL ranking", "[Download]")
+        # host → (average seconds to first byte,)
+        self._hosts = PersistedTable(
+            db_path, "host_latency", ("host TEXT",), ("seconds REAL NOT NULL",),
+            "host response times", "[Download]")
+        self._variants: dict = {}   # app_id → {variant: succeeded_at}
+        for (app_id, variant), (succeeded_at,) in self._successes.rows.items():
+            self._variants.setdefault(app_id, {})[variant] = succeeded_at
+
+    @staticmethod
+    def _split(url: str) -> tuple:
+        from urllib.parse import urlsplit
+        parts = urlsplit(url)
+        return parts.hostname or "", parts.path.rsplit("/", 1)[-1]
+
+    def order(self, app_id: str, urls: list) -> list:
+        """urls reordered: the app's successful variants (most recent first),
+        then the rest as given; mirrors of one variant by host speed."""
+        with self._lock:
+            known = dict(self._variants.get(str(app_id), {}))
+            hosts = {host: seconds for host, (seconds,) in self._hosts.rows.items()}
+        first_seen: dict = {}
+        keys = []
+        for i, url in enumerate(urls):
+            host, variant = self._split(url)
+            first_seen.setdefault(variant, i)
+            keys.append((-known.get(variant, 0), first_seen[variant], hosts.get(host, 0.0), i))
+        return [url for _key, url in sorted(zip(keys, urls))]
+
+    def record_success(self, app_id: str, url: str) -> None:
+        app_id = str(app_id)
+        variant = self._split(url)[1]
+        now = time.time()
+        with self._lock:
+            self._variants.setdefault(app_id, {})[variant] = now
+            self._successes.set((app_id, variant), (now,))
+
+    def record_latency(self, host: str, seconds: float) -> None:
+        """Fold one time-to-first-byte sample into host's moving average."""
+        with self._lock:
+            old = self._hosts.rows.get(host)
+            self._hosts.set(host, (seconds if old is None else (
+                old[0] + HOST_LATENCY_ALPHA * (seconds - old[0])),))
+
+    def host_summary(self) -> str:
+        with self._lock:
+            return ", ".join(f"{host} {seconds * 1000:.0f} ms"
+                             for host, (seconds,) in sorted(self._hosts.rows.items(),
+                                                            key=lambda kv: kv[1]))
+
+    def save(self) -> None:
+        """Flush learned variants and host averages to disk."""
+        with self._lock:
+            self._successes.save()
+            self._hosts.save()
+
+
+_url_ranking: UrlRanking | None = None
+_url_ranking_lock = threading.Lock()
+
+
+def url_ranking() -> UrlRanking:
+    """The shared UrlRanking, opened on first use."""
+    global _url_ranking
+    if _url_ranking is None:
+        with _url_ranking_lock:
+            if _url_ranking is None:
+                _url_ranking = UrlRanking(_data_path(STATE_DB_FILE))
+    return _url_ranking
+
+
+class Downloader:
+    """asyncio download engine for image files, on its own event-loop thread.
+
+    fetch() may be called from any thread and returns a
+    concurrent.futures.Future: block on .result() from a worker, wait on many
+    with as_completed(), or attach a done callback. Done callbacks run on the
+    loop thread, so Tk code must hop back with root.after. Each host gets at
+    most per_host requests at once, so thousands of queued fetches cost one
+    coroutine each rather than one blocked thread.
+
+    The HTTP itself goes through the shared requests session (_http()), so
+    proxies, TLS, redirects, chunked bodies and keep-alive pooling are
+    handled there. Only the blocking request runs in the loop's executor,
+    on one of DOWNLOAD_WORKERS threads, while it holds its host's slot.
+    Bodies are written as received, never decoded or re-encoded, and only
+    renamed into place once complete and recognised as an image by their
+    leading bytes.
+    Every file written gets a sidecar (see write_image_meta) holding the
+    response's ETag and Last-Modified, so revalidate() can later ask the CDN
+    whether the file changed and pay only for a 304 when it has not.
+    """
+
+    def __init__(self, per_host: int = DOWNLOAD_PER_HOST, timeout: float = DOWNLOAD_TIMEOUT_S):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._limits: dict = {}    # host → asyncio.Semaphore
+        self._inflight: dict = {}  # dest → task, so one file is fetched once at a time
+        self._executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS,
+                                            thread_name_prefix="Download")
+        self.bytes_received = 0    # response body bytes read
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="Downloader", daemon=True)
+        self._thread.start()
+
+    def fetch(self, urls: list, dest: str, min_size: int = 1,
+              timeout: float | None = None, label: str = "",
+              app_id: str = "", negative: NegativeCache | None = None,
+              ranking: UrlRanking | None = None) -> Future:
+        """Stream the first of urls that answers 200 with at least min_size
+        bytes into dest (through dest.part, renamed when complete).
+        With a NegativeCache, URLs it lists as recently failed are skipped
+        and new failures for app_id are recorded in it. With a UrlRanking,
+        urls are tried in its learned order for app_id and the outcome and
+        per-host response times are fed back into it.
+        The future's result is the URL that was used, or None."""
+        return asyncio.run_coroutine_threadsafe(
+            self._fetch_shared(urls, dest, min_size, timeout or self.timeout, label or dest,
+                               app_id, negative, ranking),
+            self._loop)
+
+    def revalidate(self, dest: str, timeout: float | None = None, label: str = "") -> Future:
+        """Conditionally re-request dest from the URL in its sidecar.
+
+        The future's result is "not-modified" (304; only fetched_at is
+        updated), "updated" (200; the new body replaced dest), "gone" (the
+        URL now 404s; dest is kept), "failed", or "unknown" when dest has
+        no sidecar to revalidate against.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._revalidate(dest, timeout or self.timeout, label or dest), self._loop)
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -- internals (loop thread only) ------------------------------------
+    async def _fetch_shared(self, urls: list, dest: str, min_size: int,
+                            timeout: float, label: str, app_id: str,
+                            negative: NegativeCache | None,
+                            ranking: UrlRanking | None) -> str | None:
+        task = self._inflight.get(dest)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_first(urls, dest, min_size, timeout, label,
+                                                           app_id, negative, ranking))
+            self._inflight[dest] = task
+            task.add_done_callback(lambda _task: self._inflight.pop(dest, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_first(self, urls: list, dest: str, min_size: int,
+                           timeout: float, label: str, app_id: str,
+                           negative: NegativeCache | None,
+                           ranking: UrlRanking | None) -> str | None:
+        if ranking is not None:
+            urls = ranking.order(app_id, urls)
+        for url in urls:
+            if negative is not None and negative.is_missing(url):
+                continue
+            try:
+                status, headers = await self._download(url, dest, min_size, timeout,
+                                                       ranking=ranking)
+            except Exception as e:
+                print(f"[Download] Error fetching {label} from {url}: {e!r}")
+                if negative is not None:
+                    negative.record(url, app_id, 0)
+                continue
+            if status == 200:
+                self._write_meta(dest, url, min_size, headers)
+                if negative is not None:
+                    negative.forget(url)
+                if ranking is not None:
+                    ranking.record_success(app_id, url)
+                return url
+            if status not in (404, 410):
+                print(f"[Download] HTTP {status} for {label} — {url}")
+            if negative is not None:
+                negative.record(url, app_id, status)
+        return None
+
+    async def _revalidate(self, dest: str, timeout: float, label: str) -> str:
+        meta = read_image_meta(dest)
+        if meta is None or not os.path.exists(dest):
+            return "unknown"
+        conditional = {}
+        if meta.get("etag"):
+            conditional["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            conditional["If-Modified-Since"] = meta["last_modified"]
+        url = meta["url"]
+        try:
+            status, headers = await self._download(
+                url, dest, meta.get("min_size", 1), timeout, conditional)
+        except Exception as e:
+            print(f"[Download] Error revalidating {label}: {e!r}")
+            return "failed"
+        if status == 304:
+            meta["fetched_at"] = time.time()
+            # A 304 may carry a fresher validator; keep whichever we were given.
+            meta["etag"] = headers.get("etag", meta.get("etag"))
+            write_image_meta(dest, meta)
+            return "not-modified"
+        if status == 200:
+            self._write_meta(dest, url, meta.get("min_size", 1), headers)
+            return "updated"
+        if status in (404, 410):
+            return "gone"
+        print(f"[Download] HTTP {status} revalidating {label} — {url}")
+        return "failed"
+
+    @staticmethod
+    def _write_meta(dest: str, url: str, min_size: int, headers: dict) -> None:
+        write_image_meta(dest, {"url": url, "min_size": min_size,
+                                "etag": headers.get("etag"),
+                                "last_modified": headers.get("last-modified"),
+                                "fetched_at": time.time()})
+
+    async def _download(self, url: str, dest: str, min_size: int, timeout: float,
+                        conditional: dict | None = None,
+                        ranking: UrlRanking | None = None) -> tuple:
+        """GET url into dest (requests follows redirects); returns the final
+        status and response headers (a 200 that was too short counts as 404).
+        conditional holds If-None-Match / If-Modified-Since request headers;
+        each hop's time to response headers is recorded in ranking."""
+        from urllib.parse import urlsplit
+        host = urlsplit(url).hostname
+        limit = self._limits.get(host)
+        if limit is None:
+            limit = self._limits[host] = asyncio.Semaphore(self.per_host)
+        async with limit:
+            status, headers, size, hops = await self._loop.run_in_executor(
+                self._executor, self._get, url, dest, min_size, timeout, conditional)
+        self.bytes_received += size
+        if ranking is not None:
+            for hop_host, seconds in hops:
+                ranking.record_latency(hop_host, seconds)
+        return status, headers
+
+    def _get(self, url: str, dest: str, min_size: int, timeout: float,
+             conditional: dict | None) -> tuple:
+        """The blocking GET, on an executor thread: (status, headers, body
+        size, [(host, seconds to headers) per hop])."""
+        from urllib.parse import urlsplit
+        with _http().get(url, stream=True, timeout=timeout,
+                         headers={"Accept-Encoding": "identity", **(conditional or {})}) as resp:
+            hops = [(urlsplit(r.url).hostname, r.elapsed.total_seconds())
+                    for r in (*resp.history, resp)]
+            if resp.status_code != 200:
+                return resp.status_code, resp.headers, 0, hops
+            part_path = f"{dest}.{threading.get_ident():x}.part"
+            size = 0
+            try:
+                with open(part_path, "wb") as out:
+                    for chunk in resp.raw.stream(DOWNLOAD_CHUNK, decode_content=False):
+                        size += len(chunk)
+                        out.write(chunk)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(part_path)
+                raise
+        # A body too short, or one that is not an image (an HTML error
+        # page served as 200), is as good as missing.
+        if size >= min_size and is_image_file(part_path):
+            os.replace(part_path, dest)
+            return 200, resp.headers, size, hops
+        os.remove(part_path)
+        return 404, resp.headers, size, hops
+
+
+_downloader_instance = None
+_downloader_lock = threading.Lock()
+
+
+def _downloader() -> Downloader:
+    """The shared Downloader, started on first use."""
+    global _downloader_instance
+    if _downloader_instance is None:
+        with _downloader_lock:
+            if _downloader_instance is None:
+                _downloader_instance = Downloader()
+    return _downloader_instance
+
+
+# ---------------------------------------------------------------------------
+# Session snapshot (warm start)
+# ---------------------------------------------------------------------------
+SNAPSHOT_MAGIC = b"SRSS"
+SNAPSHOT_VERSION = 1
+# magic, format version, reserved, payload length, crc32 of the payload
+_SNAPSHOT_HEADER = struct.Struct("<4sHHII")
+
+
+def write_snapshot(path: str, state: dict) -> bool:
+    """Write state as a header + zlib-compressed JSON payload.
+
+    The file is written to a temporary name and renamed into place, so a crash
+    mid-write leaves the previous snapshot intact.
+    """
+    try:
+        payload = zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"), 6)
+        header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0,
+                                       len(payload), zlib.crc32(payload))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(header)
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"[Snapshot] Could not write {path}: {e}")
+        return False
+
+
+def read_snapshot(path: str) -> dict | None:
+    """Memory-map and validate a snapshot written by write_snapshot.
+
+    Returns None (a cold start) if the file is missing, from another format
+    version, truncated, or fails its checksum.
+    """
+    import mmap
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < _SNAPSHOT_HEADER.size:
+                raise ValueError("file is truncated")
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, _reserved, length, crc = _SNAPSHOT_HEADER.unpack_from(mm, 0)
+                if magic != SNAPSHOT_MAGIC:
+                    raise ValueError("not a snapshot file")
+                if version != SNAPSHOT_VERSION:
+                    print(f"[Snapshot] Format v{version} is not supported; cold start.")
+                    return None
+                if _SNAPSHOT_HEADER.size + length != size:
+                    raise ValueError("length mismatch (torn write?)")
+                payload = mm[_SNAPSHOT_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            raise ValueError("checksum mismatch")
+        state = json.loads(zlib.decompress(payload))
+        if not isinstance(state, dict):
+            raise ValueError("unexpected payload")
+        return state
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, zlib.error) as e:
+        print(f"[Snapshot] Ignoring {os.path.basename(path)}: {e}; cold start.")
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Achievement store
+# ---------------------------------------------------------------------------
+class AchievementStore:
+    """Persistent achievement results, so the achievement filter only asks
+    the Web API about games that may have changed.
+
+    Schema support (does an app have achievements at all) is kept per app for
+    ACHIEVEMENT_SCHEMA_TTL_S. Progress is kept per (steam_id, app_id) along
+    with the game's rtime_last_played from GetOwnedGames at the time it was
+    checked: it stays valid while that value is unchanged (achievements are
+    only earned by playing), up to ACHIEVEMENT_PROGRESS_MAX_AGE_S. When the
+    last-played time is unknown, progress expires after
+    ACHIEVEMENT_PROGRESS_TTL_S.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # app_id → (supported, checked_at)
+        self._schema = PersistedTable(
+            db_path, "achievement_schema", ("app_id TEXT",),
+            ("supported INTEGER NOT NULL", "checked_at REAL NOT NULL"),
+            "achievement store", "[Achievements]")
+        # (steam_id, app_id) → (total, unlocked, last_played, checked_at)
+        self._progress = PersistedTable(
+            db_path, "achievement_progress", ("steam_id TEXT NOT NULL", "app_id TEXT NOT NULL"),
+            ("total INTEGER NOT NULL", "unlocked INTEGER NOT NULL", "last_played INTEGER",
+             "checked_at REAL NOT NULL"),
+            "achievement progress", "[Achievements]")
+
+    def schema(self, app_id: str) -> bool | None:
+        """Whether app_id has achievements, or None if unknown or expired."""
+        with self._lock:
+            row = self._schema.rows.get(app_id)
+        if row is None or time.time() - row[1] >= ACHIEVEMENT_SCHEMA_TTL_S:
+            return None
+        return bool(row[0])
+
+    def set_schema(self, app_id: str, supported: bool) -> None:
+        with self._lock:
+            self._schema.set(app_id, (int(supported), time.time()))
+
+    def progress(self, steam_id: str, app_id: str, last_played: int | None) -> dict | None:
+        """Stored {"total", "unlocked"} for the user's game, or None if it
+        must be re-fetched: never checked, played since, or too old."""
+        with self._lock:
+            row = self._progress.rows.get((steam_id, app_id))
+        if row is None:
+            return None
+        total, unlocked, stored_played, checked_at = row
+        age = time.time() - checked_at
+        if last_played is None or stored_played is None:
+            fresh = age < ACHIEVEMENT_PROGRESS_TTL_S
+        else:
+            fresh = last_played == stored_played and age < ACHIEVEMENT_PROGRESS_MAX_AGE_S
+        return {"total": total, "unlocked": unlocked} if fresh else None
+
+    def set_progress(self, steam_id: str, app_id: str, result: dict,
+                     last_played: int | None) -> None:
+        with self._lock:
+            self._progress.set((steam_id, app_id), (
+                result["total"], result["unlocked"], last_played, time.time()))
+
+    def save(self) -> None:
+        """Flush new and refreshed results to disk."""
+        with self._lock:
+            self._schema.save()
+            self._progress.save()
+
+
+# ---------------------------------------------------------------------------
+# Engine (display-independent core shared by the GUI and the CLI)
+# ---------------------------------------------------------------------------
+class SteamRouletteEngine:
+    """Owns the game pool and everything that does not need a display:
+    library scanning, exclusions, achievement filtering, the header image
+    cache and winner selection.
+
+    Methods that mutate the pool (apply_library_delta, add/remove_uninstalled,
+    exclusions) are not locked; the GUI calls them on the Tk main thread.
+    Long-running methods accept an on_progress(done, total) callback that is
+    invoked from worker threads.
+    """
+
+    def __init__(self, steam_path: str | None = None, cache_dir: str | None = None):
+        self.steam_path = steam_path
+        self.cache_dir = cache_dir or create_cache_directory()
+        self.installed_games: list = []
+        self.excluded_games: list = []
+        self.uninstalled_games: list = []
+        self.images = ImageCache()
+        self.api_key: str = self.load_text_file("apikey.txt")
+        self.libraries: list | None = None   # from discovery; None = read libraryfolders.vdf
+        self.index: LibraryIndex | None = None
+        self.library_watcher: LibraryWatcher | None = None
+        self.appinfo = AppInfoReader.open(steam_path)
+        self._icon_atlas: IconAtlas | None = None
+        self._achievements: AchievementStore | None = None
+        self._open_lock = threading.Lock()   # guards the lazily opened stores above
+        self.last_played: dict = {}   # app_id → rtime_last_played from GetOwnedGames
+        self.community_stats: set = set()   # owned app_ids with has_community_visible_stats
+        self._owned: tuple | None = None         # (steam_id, fetched_at, games)
+        self._owned_inflight: Future | None = None
+        self._owned_lock = threading.Lock()
+
+    @classmethod
+    def discover(cls) -> "SteamRouletteEngine | None":
+        """Engine for the local Steam install, or None if Steam was not found."""
+        steam = discover_steam(_data_path(DISCOVERY_CACHE_FILE))
+        if not steam:
+            return None
+        engine = cls(steam["steam_path"])
+        engine.libraries = steam["libraries"]
+        return engine
+
+    # ------------------------------------------------------------------
+    # Settings files
+    # ------------------------------------------------------------------
+    @staticmethod
+    def load_text_file(filename: str) -> str:
+        path = _data_path(filename)
+        if os.path.exists(path):
+            with open(path, "r") as fh:
+                return fh.read().strip()
+        return ""
+
+    @staticmethod
+    def save_text_file(filename: str, content: str) -> None:
+        with open(_data_path(filename), "w") as fh:
+            fh.write(content)
+
+    def set_api_key(self, api_key: str) -> None:
+        self.save_text_file("apikey.txt", api_key)
+        self.api_key = api_key
+
+    def load_user_id(self) -> str:
+        return self.load_text_file("steamuserid.txt")
+
+    def save_user_id(self, user_id: str) -> None:
+        self.save_text_file("steamuserid.txt", user_id)
+
+    def fetch_steam_user_id(self, steam_id: str) -> str | None:
+        """Verify a Steam ID via the Web API and return it (or None on failure)."""
+        result = steam_api().call("ISteamUser/GetPlayerSummaries/v2",
+                                  {"key": self.api_key, "steamids": steam_id})
+        if not result.ok:
+            print(f"Error fetching Steam User ID: {result.error}")
+            return None
+        players = (result.data.get("response") or {}).get("players", [])
+        return players[0].get("steamid") if players else None
+
+    # ------------------------------------------------------------------
+    # Library
+    # ------------------------------------------------------------------
+    def scan(self, parallel: bool = True, on_batch=None) -> list:
+        """(Re)build installed_games from the Steam libraries and shortcuts.
+
+        With on_batch, games are instead handed to on_batch(games) from the
+        scan threads as they are read and installed_games is left alone; the
+        caller merges the batches itself (apply_library_delta on its own
+        thread). The full list is returned either way.
+        """
+        if not self.steam_path:
+            if on_batch is None:
+                self.installed_games = []
+            return []
+        if self.index is None:
+            self.index = LibraryIndex(_data_path(STATE_DB_FILE))
+        games = get_installed_games(self.steam_path, self.index, parallel=parallel,
+                                    libraries=self.libraries, on_batch=on_batch)
+        shortcuts = get_shortcut_games(self.steam_path, _data_path(SHORTCUTS_CACHE_FILE))
+        games += shortcuts
+        if on_batch is None:
+            self.installed_games = games
+        elif shortcuts:
+            on_batch(shortcuts)
+        return games
+
+    def start_watcher(self, on_change) -> None:
+        """Start a LibraryWatcher; on_change(updated, removed) runs on its thread."""
+        if not self.steam_path:
+            return
+        self.library_watcher = LibraryWatcher(self.steam_path, on_change, index=self.index)
+        self.library_watcher.start()
+
+    def stop_watcher(self) -> None:
+        if self.library_watcher is not None:
+            self.library_watcher.stop()
+
+    def reconcile_scan(self, scanned: list) -> list:
+        """Drop installed games a completed scan no longer found (they came
+        from a snapshot). Returns the removed app IDs."""
+        found = {str(g["app_id"]) for g in scanned}
+        owned_only = {str(g["app_id"]) for g in self.uninstalled_games}
+        stale = [str(g["app_id"]) for g in self.installed_games
+                 if str(g["app_id"]) not in found and str(g["app_id"]) not in owned_only]
+        if stale:
+            self.apply_library_delta([], stale)
+        return stale
+
+    # ------------------------------------------------------------------
+    # Warm-start snapshot
+    # ------------------------------------------------------------------
+    def load_snapshot(self, path: str | None = None) -> bool:
+        """Restore the pool from the last session.
+
+        The caller still runs a scan (and any network refresh) afterwards;
+        reconcile_scan and replace_uninstalled bring the restored state up to
+        date. Returns False on a cold start.
+        """
+        state = read_snapshot(path or _data_path(SNAPSHOT_FILE))
+        if not state or state.get("steam_path") != self.steam_path:
+            return False
+        try:
+            installed = [g for g in state["installed_games"] if g.get("app_id")]
+            uninstalled = [g for g in state.get("uninstalled_games", []) if g.get("app_id")]
+        except (KeyError, TypeError, AttributeError) as e:
+            print(f"[Snapshot] Unexpected contents ({e}); cold start.")
+            return False
+        print(f"[Snapshot] Restored {len(installed)} installed and {len(uninstalled)} "
+              f"uninstalled game(s).")
+        self.installed_games = installed
+        self.add_uninstalled(uninstalled)
+        return True
+
+    def save_snapshot(self, path: str | None = None) -> bool:
+        """Write the current pool for the next start (achievement results
+        are kept in the AchievementStore instead)."""
+        owned_only = {str(g["app_id"]) for g in self.uninstalled_games}
+        state = {
+            "steam_path": self.steam_path,
+            "saved_at": time.time(),
+            "installed_games": [g for g in self.installed_games
+                                if str(g["app_id"]) not in owned_only],
+            "uninstalled_games": self.uninstalled_games,
+        }
+        return write_snapshot(path or _data_path(SNAPSHOT_FILE), state)
+
+    def apply_library_delta(self, updated: list, removed: list,
+                            announce: bool = True) -> list:
+        """Merge added/changed game records and removed app IDs into the pool.
+        Returns the records that were not in the pool before. announce=False
+        skips the per-game log lines (used while the startup scan streams in)."""
+        removed_ids = set(removed)
+        if removed_ids:
+            self.installed_games = [g for g in self.installed_games
+                                    if str(g["app_id"]) not in removed_ids]
+            for app_id in removed_ids:
+                self.images.pop(app_id)
+            for app_id in removed_ids:
+                print(f"[Library] Removed from pool: {app_id}")
+
+        by_id = {str(g["app_id"]): g for g in self.installed_games}
+        owned_only = {str(g["app_id"]) for g in self.uninstalled_games}
+        now_installed = set()
+        new_games = []
+        for game in updated:
+            app_id = str(game["app_id"])
+            if app_id in owned_only:
+                # A game that was only owned is now installed
+                now_installed.add(app_id)
+            existing = by_id.get(app_id)
+            if existing is not None:
+                existing.update(name=game.get("name"), path=game.get("path"))
+                continue
+            self.installed_games.append(game)
+            by_id[app_id] = game
+            new_games.append(game)
+            if announce:
+                print(f"[Library] Installed: {game.get('name')} ({app_id})")
+        if now_installed:
+            self.uninstalled_games = [g for g in self.uninstalled_games
+                                      if str(g["app_id"]) not in now_installed]
+        return new_games
+
+    def apply_local_appinfo(self) -> tuple:
+        """Merge icon hashes from appinfo.vdf into installed_games and find
+        tools/DLC that should leave the pool.
+
+        Returns (all_covered, non_game_ids): all_covered is True if every game
+        now has an icon hash. The caller removes non_game_ids from the pool
+        (via apply_library_delta) on its own thread.
+        """
+        if self.appinfo is None:
+            return False, []
+        games = list(self.installed_games)
+        info = self.appinfo.get(str(g["app_id"]) for g in games)
+        non_games = set()
+        for game in games:
+            app_id = str(game["app_id"])
+            entry = info.get(app_id)
+            if entry is None:
+                continue
+            if entry["type"] and is_non_game_type(entry["type"]):
+                non_games.add(app_id)
+            elif entry["icon"] and not game.get("img_icon_url"):
+                game["img_icon_url"] = entry["icon"]
+        if non_games:
+            print(f"[AppInfo] Removing {len(non_games)} non-game app(s) from the pool.")
+        print(f"[AppInfo] Local metadata found for {len(info)} of {len(games)} installed games.")
+        covered = all(g.get("img_icon_url") or g.get("shortcut") or str(g["app_id"]) in non_games
+                      for g in games)
+        return covered, sorted(non_games)
+
+    def is_non_game(self, game: dict) -> bool:
+        """True if appinfo.vdf says this app is a tool, DLC, etc."""
+        if self.appinfo is None or game.get("shortcut"):
+            return False
+        app_id = str(game["app_id"])
+        entry = self.appinfo.get([app_id]).get(app_id)
+        return bool(entry and is_non_game_type(entry["type"]))
+
+    def owned_games(self, max_age: float = OWNED_GAMES_TTL_S) -> list:
+        """GetOwnedGames for the configured user, at most max_age seconds old.
+
+        The answer is kept in memory and in OWNED_GAMES_FILE, and concurrent
+        callers share one in-flight request. Also refreshes last_played,
+        which decides which stored achievement progress is still current, and
+        community_stats, which says which owned games have stats at all.
+        """
+        steam_id = self.load_user_id()
+        with self._owned_lock:
+            games = self._cached_owned(steam_id, max_age)
+            if games is not None:
+                return games
+            future = self._owned_inflight
+            leader = future is None
+            if leader:
+                future = self._owned_inflight = Future()
+        if not leader:
+            return future.result()
+        try:
+            games = get_all_games(self.api_key, steam_id)
+            if games:
+                self._set_owned(steam_id, time.time(), games)
+                write_snapshot(_data_path(OWNED_GAMES_FILE), {
+                    "steam_id": steam_id,
+                    "fetched_at": self._owned[1],
+                    "fields": OWNED_GAME_FIELDS,
+                    "rows": [[g.get(k) for k in OWNED_GAME_FIELDS] for g in games],
+                })
+            future.set_result(games)
             return games
-        print("No games found in Steam API response.")
-        return []
-    except Exception as e:
-        print(f"Error fetching games from Steam API: {e}")
-        return []
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._owned_lock:
+                self._owned_inflight = None
+
+    def _cached_owned(self, steam_id: str, max_age: float) -> list | None:
+        # Caller holds _owned_lock. The disk copy is read once per session.
+        if self._owned is None:
+            self._owned = (None, 0, [])
+            state = read_snapshot(_data_path(OWNED_GAMES_FILE))
+            try:
+                if state and state.get("steam_id") == steam_id:
+                    fields = state["fields"]
+                    self._set_owned(state["steam_id"], state["fetched_at"],
+                                    [{k: v for k, v in zip(fields, row) if v is not None}
+                                     for row in state["rows"]])
+            except (KeyError, TypeError) as e:
+                print(f"[API] Ignoring cached owned games: {e}")
+        cached_id, fetched_at, games = self._owned
+        if cached_id == steam_id and games and time.time() - fetched_at < max_age:
+            return games
+        return None
+
+    def _set_owned(self, steam_id: str, fetched_at: float, games: list) -> None:
+        self._owned = (steam_id, fetched_at, games)
+        self.community_stats = {str(g["appid"]) for g in games
+                                if "appid" in g and g.get("has_community_visible_stats")}
+        self.last_played = {str(g["appid"]): g.get("rtime_last_played", 0)
+                            for g in games if "appid" in g}
+
+    def fetch_icon_hashes(self) -> None:
+        """Fetch img_icon_url for installed games from the Steam API and merge
+        them into installed_games so icons can be shown even when uninstalled
+        games haven't been loaded.
+
+        A cached or in-flight owned-games answer is reused; otherwise only
+        the installed games still missing a hash are asked for.
+        """
+        api_key = self.api_key
+        user_id = self.load_user_id()
+        if not api_key or not user_id:
+            return  # not configured yet — skip silently
+
+        with self._owned_lock:
+            all_games = self._cached_owned(user_id, OWNED_GAMES_TTL_S)
+            inflight = self._owned_inflight
+        try:
+            if all_games is None and inflight is not None:
+                all_games = inflight.result()
+            if all_games is None:
+                missing = [str(g["app_id"]) for g in self.installed_games
+                           if not g.get("img_icon_url") and not g.get("shortcut")]
+                if not missing:
+                    return
+                all_games = get_all_games(api_key, user_id, app_ids=missing)
+        except Exception as e:
+            print(f"Could not fetch icon hashes: {e}")
+            return
+
+        if not all_games:
+            return
+
+        # Build a lookup: appid (str) → img_icon_url
+        hash_map = {
+            str(g["appid"]): g.get("img_icon_url", "")
+            for g in all_games
+            if "appid" in g and g.get("img_icon_url")
+        }
+
+        # Merge into installed_games in-place (thread-safe: only writing new keys)
+        for game in self.installed_games:
+            app_id = str(game["app_id"])
+            if app_id in hash_map and not game.get("img_icon_url"):
+                game["img_icon_url"] = hash_map[app_id]
+
+        print(f"Icon hashes merged for {len(hash_map)} games.")
+
+    # ------------------------------------------------------------------
+    # Uninstalled games
+    # ------------------------------------------------------------------
+    def fetch_uninstalled_games(self) -> list | None:
+        """Owned games that are not installed, or None if the API returned nothing."""
+        all_games = self.owned_games()
+        if not all_games:
+            return None
+        owned_only = {str(g["app_id"]) for g in self.uninstalled_games}
+        installed_ids = {str(g["app_id"]) for g in self.installed_games} - owned_only
+        local = self.appinfo.get(str(g["appid"]) for g in all_games if "appid" in g) \
+            if self.appinfo is not None else {}
+        return [
+            {
+                "app_id": str(g["appid"]),
+                "name": (g.get("name") or local.get(str(g["appid"]), {}).get("name")
+                         or f"App {g['appid']}").strip(),
+                "img_icon_url": (g.get("img_icon_url")
+                                 or local.get(str(g["appid"]), {}).get("icon", "")),
+            }
+            for g in all_games
+            if "appid" in g
+            and str(g["appid"]) not in installed_ids
+            and str(g["appid"]) not in NON_GAME_APP_IDS
+            and not is_non_game_type(local.get(str(g["appid"]), {}).get("type", ""))
+        ]
+
+    def add_uninstalled(self, games: list) -> None:
+        self.uninstalled_games = games
+        self.installed_games.extend(games)
+
+    def replace_uninstalled(self, games: list) -> None:
+        """Swap in a freshly fetched uninstalled list (e.g. over a snapshot's)."""
+        self.remove_uninstalled()
+        self.add_uninstalled(games)
+
+    def remove_uninstalled(self) -> int:
+        """Drop uninstalled games from the pool; returns how many were removed."""
+        count = len(self.uninstalled_games)
+        if count:
+            uninstalled_ids = {g["app_id"] for g in self.uninstalled_games}
+            self.installed_games = [g for g in self.installed_games
+                                    if g["app_id"] not in uninstalled_ids]
+            self.uninstalled_games = []
+        return count
+
+    # ------------------------------------------------------------------
+    # Exclusions
+    # ------------------------------------------------------------------
+    def load_exclusions(self) -> None:
+        path = _data_path("excluded_games.json")
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as fh:
+                    self.excluded_games = json.load(fh)
+                print(f"Loaded {len(self.excluded_games)} exclusions.")
+            except Exception as e:
+                print(f"Error loading exclusions: {e}")
+
+    def save_exclusions(self) -> None:
+        try:
+            with open(_data_path("excluded_games.json"), "w") as fh:
+                json.dump(self.excluded_games, fh)
+        except Exception as e:
+            print(f"Error saving exclusions: {e}")
+
+    def set_exclusions(self, app_ids: list) -> None:
+        self.excluded_games = list(app_ids)
+        self.save_exclusions()
+
+    # ------------------------------------------------------------------
+    # Header images
+    # ------------------------------------------------------------------
+    def fetch_header(self, game: dict) -> Image.Image:
+        """fetch_header_image for a game record (handles non-Steam shortcuts)."""
+        return fetch_header_image(game["app_id"], self.cache_dir,
+                                  game_name=game.get("name", ""),
+                                  local_path=game.get("header_path", ""),
+                                  allow_network=not game.get("shortcut"),
+                                  steam_path=self.steam_path)
+
+    def get_image(self, game: dict) -> Image.Image:
+        """Header image for a game, from the in-memory cache or fetched into it."""
+        app_id = game["app_id"]
+        img = self.images.get(app_id)
+        if img is None:
+            img = self.fetch_header(game)
+            # The cached file is already encoded; keep its bytes as they are
+            try:
+                with open(os.path.join(self.cache_dir, f"{app_id}.jpg"), "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                data = None     # placeholder
+            self.images.put(app_id, img, data)
+        return img
+
+    def cache_header_bytes(self, game: dict, downloaded: bool = False) -> bool:
+        """Put a game's header file into the memory cache still encoded;
+        it is decoded only when shown (see ImageCache.get). `downloaded`
+        counts it as a network fetch. False if there is no local copy of it."""
+        app_id = game["app_id"]
+        if app_id in self.images:
+            return True
+        tier = stage_header_file(app_id, self.cache_dir, game.get("name") or app_id,
+                                 game.get("header_path", ""), self.steam_path)
+        if tier is None:
+            return False
+        try:
+            with open(os.path.join(self.cache_dir, f"{app_id}.jpg"), "rb") as fh:
+                data = fh.read()
+        except OSError:
+            return False
+        self.images.put_bytes(app_id, data)
+        _count_image_source("network" if downloaded else tier)
+        return True
+
+    def get_scaled_image(self, game: dict, size: tuple) -> Image.Image:
+        """Header image scaled to size (e.g. the canvas), via the rendition
+        cache. Blocking; call from a worker thread."""
+        app_id = game["app_id"]
+        source_path = os.path.join(self.cache_dir, f"{app_id}.jpg")
+        img = None
+        # Shortcuts may have newer grid art to copy in first
+        if game.get("header_path") or not os.path.exists(source_path):
+            img = self.get_image(game)
+        try:
+            # On a rendition miss, rescale the preloaded header if it is cached
+            return derived_image(source_path, self.cache_dir, str(app_id), size,
+                                 source=img or (lambda: self.images.get(app_id)))
+        except OSError:
+            # Placeholder: nothing on disk to derive from
+            return (img or self.get_image(game)).resize(size, Image.Resampling.LANCZOS)
+
+    def prefetch_header(self, game: dict) -> Future | None:
+        """Start downloading a game's header into image_cache, unless it is
+        already available locally. Returns the download future, or None."""
+        app_id = game.get("app_id")
+        if (not app_id or game.get("shortcut")
+                or os.path.exists(os.path.join(self.cache_dir, f"{app_id}.jpg"))
+                or find_steam_library_image(self.steam_path, app_id)):
+            return None   # fetch_header picks these up from disk
+        return _downloader().fetch(header_urls(app_id),
+                                   os.path.join(self.cache_dir, f"{app_id}.jpg"),
+                                   min_size=1025, label=game.get("name") or app_id,
+                                   app_id=app_id, negative=negative_cache(),
+                                   ranking=url_ranking())
+
+    def prefetch_icon(self, game: dict) -> Future | None:
+        """Start downloading a game's icon into image_cache, unless it is
+        already available locally. Returns the download future, or None."""
+        app_id = str(game.get("app_id") or "")
+        if (not app_id or game.get("shortcut")
+                or os.path.exists(os.path.join(self.cache_dir, f"icon_{app_id}.png"))
+                or os.path.exists(os.path.join(self.cache_dir, f"icon_{app_id}.jpg"))):
+            return None
+        return _downloader().fetch(icon_urls(app_id, game.get("img_icon_url", "")),
+                                   os.path.join(self.cache_dir, f"icon_{app_id}.png"),
+                                   min_size=65, timeout=6, label=game.get("name") or app_id,
+                                   app_id=app_id, negative=negative_cache(),
+                                   ranking=url_ranking())
+
+    def icon_atlas(self) -> IconAtlas:
+        """The packed exclude-list icons, opened on first use."""
+        with self._open_lock:
+            if self._icon_atlas is None:
+                self._icon_atlas = IconAtlas(os.path.join(self.cache_dir, ICON_ATLAS_FILE))
+            return self._icon_atlas
+
+    def _icon_stamp(self, game: dict) -> int:
+        local_path = game.get("icon_path", "")
+        if not local_path:
+            return 0
+        try:
+            return os.stat(local_path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def cached_icon(self, game: dict) -> Image.Image | None:
+        """A game's icon if it is already in the atlas (no file access for
+        downloaded icons), else None."""
+        return self.icon_atlas().get(str(game["app_id"]), self._icon_stamp(game))
+
+    def get_icon(self, game: dict) -> Image.Image:
+        """A game's ICON_SIZE icon: from the atlas, else decoded from its local
+        or cached file (never the network) and packed into the atlas."""
+        app_id = str(game["app_id"])
+        stamp = self._icon_stamp(game)
+        atlas = self.icon_atlas()
+        img = atlas.get(app_id, stamp)
+        if img is None:
+            img = fetch_game_icon(app_id, game.get("img_icon_url", ""), self.cache_dir,
+                                  size=atlas.size, game_name=game.get("name", ""),
+                                  local_path=game.get("icon_path", ""), allow_network=False)
+            # Only real icons are packed, so a later download replaces a
+            # placeholder (a shortcut's icon_path is often an .exe)
+            if os.path.exists(os.path.join(self.cache_dir, f"icon_{app_id}.png")) \
+                    or (stamp and is_image_file(game["icon_path"])):
+                atlas.put(app_id, img, stamp)
+        return img
+
+    def save_caches(self) -> None:
+        """Flush the on-disk download, icon and achievement bookkeeping."""
+        negative_cache().save()
+        url_ranking().save()
+        if self._icon_atlas is not None:
+            self._icon_atlas.save()
+        if self._achievements is not None:
+            self._achievements.save()
+
+    def preload_images(self, games: list, on_progress=None) -> int:
+        """Fetch every game's header and put its file bytes in the memory
+        cache (blocking). Nothing is decoded here: ImageCache.get does that
+        when a header is actually shown.
+
+        All downloads are queued on the shared async Downloader at once;
+        on_progress(done, total) is called from this thread as they finish.
+        Returns the number of headers downloaded.
+        """
+        total = len(games)
+        pending = {}
+        for game in games:
+            future = self.prefetch_header(game)
+            if future is not None:
+                pending[future] = game
+            elif game.get("app_id"):
+                self.cache_header_bytes(game)
+        done = total - len(pending)
+        if on_progress and done:
+            on_progress(done, total)
+        downloaded = 0
+        for future in as_completed(pending):
+            if future.exception() is None and future.result():
+                downloaded += 1
+                self.cache_header_bytes(pending[future], downloaded=True)
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+        negative_cache().save()
+        url_ranking().save()
+        return downloaded
+
+    def clear_image_cache(self) -> int:
+        """Delete all cached images so they are re-fetched on next use."""
+        count = 0
+        for f in os.listdir(self.cache_dir):
+            if f.endswith(".jpg"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, f))
+                    count += 1
+                except OSError as e:
+                    print(f"Could not delete {f}: {e}")
+        # Any sidecar whose image is gone (headers just now, icons by hand)
+        for f in os.listdir(self.cache_dir):
+            if f.endswith(IMAGE_META_SUFFIX) and not os.path.exists(
+                    os.path.join(self.cache_dir, f[:-len(IMAGE_META_SUFFIX)])):
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.cache_dir, f))
+        shutil.rmtree(os.path.join(self.cache_dir, DERIVED_CACHE_SUBDIR), ignore_errors=True)
+        self.images.clear()
+        missing = negative_cache()
+        missing.clear()
+        missing.save()
+        return count
+
+    def revalidate_images(self, max_age: float = IMAGE_REVALIDATE_AFTER_S,
+                          on_progress=None) -> dict:
+        """Ask the CDN whether downloaded images older than max_age changed.
+
+        Only files with a validator sidecar (i.e. ones the Downloader wrote)
+        are checked. Unchanged files cost a 304 and keep their bytes; changed
+        ones are replaced in place, dropped from the memory cache, and their
+        derived renditions rebuild on next use because the source mtime moved.
+        Returns a count per outcome.
+        """
+        now = time.time()
+        stale = []
+        for f in os.listdir(self.cache_dir):
+            if not f.endswith(IMAGE_META_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, f[:-len(IMAGE_META_SUFFIX)])
+            if not os.path.exists(path):
+                # Orphaned by an image deleted outside the app
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.cache_dir, f))
+                continue
+            meta = read_image_meta(path)
+            if meta and now - meta.get("fetched_at", 0) >= max_age:
+                stale.append(path)
+        counts: dict = {}
+        if not stale:
+            return counts
+        downloader = _downloader()
+        received_before = downloader.bytes_received
+        futures = {downloader.revalidate(path, label=os.path.basename(path)): path
+                   for path in stale}
+        for done, future in enumerate(as_completed(futures), 1):
+            outcome = future.result()
+            counts[outcome] = counts.get(outcome, 0) + 1
+            if outcome == "updated":
+                name = os.path.splitext(os.path.basename(futures[future]))[0]
+                if name.isdigit():
+                    self.images.pop(name)
+                elif name.startswith("icon_") and self._icon_atlas is not None:
+                    self._icon_atlas.discard(name[len("icon_"):])
+            if on_progress:
+                on_progress(done, len(stale))
+        received = downloader.bytes_received - received_before
+        print(f"[Image] Revalidated {len(stale)} cached image(s): "
+              + ", ".join(f"{n} {k}" for k, n in sorted(counts.items()))
+              + f" ({received / 1024:.0f} KB received)")
+        return counts
 
+    # ------------------------------------------------------------------
+    # Achievements
+    # ------------------------------------------------------------------
+    def achievement_store(self) -> AchievementStore:
+        """The persistent achievement results, opened on first use."""
+        with self._open_lock:
+            if self._achievements is None:
+                self._achievements = AchievementStore(_data_path(STATE_DB_FILE))
+            return self._achievements
+
+    def achievement_progress(self, app_ids, on_progress=None) -> dict:
+        """Achievement progress for many games: app_id → {"total", "unlocked"}.
+
+        Every lookup goes through one bounded pool of ACHIEVEMENT_WORKERS
+        threads; on_progress(done, total) is called from those threads.
+        Results come from the AchievementStore where still current, so
+        only games played since their last check cost a request.
+        """
+        app_ids = list(dict.fromkeys(str(a) for a in app_ids))
+        if self.api_key and self.load_user_id():
+            # Recent last-played times tell us which stored results are current
+            self.owned_games(max_age=OWNED_GAMES_ACHIEVEMENT_MAX_AGE_S)
+        total = len(app_ids)
+        completed = 0
+        lock = threading.Lock()
 
-def get_uninstalled_games_from_api(api_key: str, steam_id: str, installed_games: list) -> list:
-    all_games = get_all_games(api_key, steam_id)
-    if not all_games:
-        return []
-    installed_ids = {str(g["app_id"]) for g in installed_games}
-    return [
-        {"app_id": str(g["appid"]), "name": g["name"]}
-        for g in all_games
-        if str(g["appid"]) not in installed_ids
-    ]
+        def _check(app_id):
+            nonlocal completed
+            try:
+                return self.get_achievement_progress(app_id)
+            finally:
+                with lock:
+                    completed += 1
+                    c = completed
+                if on_progress:
+                    on_progress(c, total)
+
+        with ThreadPoolExecutor(max_workers=ACHIEVEMENT_WORKERS) as ex:
+            results = dict(zip(app_ids, ex.map(_check, app_ids)))
+        self.achievement_store().save()
+        failed = sum(1 for r in results.values() if r.get("failed"))
+        if failed:
+            print(f"[Achievements] {failed} game(s) could not be checked right now; "
+                  f"they will be re-checked next time.")
+        print(f"[API] {steam_api().summary()}")
+        return results
 
+    @staticmethod
+    def _all_unlocked(progress: dict) -> bool:
+        return progress["total"] > 0 and progress["unlocked"] == progress["total"]
+
+    def exclude_achievement_games(self, on_progress=None) -> int:
+        """Add every game with all achievements unlocked to excluded_games.
+        Returns how many were added."""
+        app_ids = [str(g["app_id"]) for g in self.installed_games + self.uninstalled_games
+                   if not g.get("shortcut")]   # non-Steam shortcuts have no achievements
+        added = 0
+        for app_id, progress in self.achievement_progress(app_ids, on_progress).items():
+            if self._all_unlocked(progress) and app_id not in self.excluded_games:
+                self.excluded_games.append(app_id)
+                added += 1
+        return added
+
+    def include_achievement_games(self, on_progress=None) -> int:
+        """Remove 100%-complete achievement games from the excluded list.
+        Returns how many were removed."""
+        results = self.achievement_progress(list(self.excluded_games), on_progress)
+        to_remove = {app_id for app_id, progress in results.items()
+                     if self._all_unlocked(progress)}
+        self.excluded_games = [a for a in self.excluded_games if str(a) not in to_remove]
+        return len(to_remove)
 
-# ---------------------------------------------------------------------------
-# Drive enumeration
-# ---------------------------------------------------------------------------
-def get_drives() -> list:
-    if platform.system() == "Windows":
-        return [f"{chr(i)}:\\" for i in range(65, 91) if os.path.exists(f"{chr(i)}:\\")]
-    elif platform.system() == "Linux":
-        import subprocess
-        result = subprocess.run(["df", "-h", "--output=source"], capture_output=True, text=True)
-        return result.stdout.splitlines()[1:]
-    elif platform.system() == "Darwin":
-        import subprocess
-        result = subprocess.run(["mount"], capture_output=True, text=True)
-        return [line.split()[2] for line in result.stdout.splitlines()]
-    return []
+    def supports_achievements(self, app_id: str) -> bool:
+        store = self.achievement_store()
+        known = store.schema(app_id)
+        if known is not None:
+            return known
+        # appinfo.vdf lists store categories; category 22 means achievements
+        if self.appinfo is not None:
+            entry = self.appinfo.get([app_id]).get(app_id)
+            if entry is not None and entry["categories"]:
+                result = ACHIEVEMENTS_CATEGORY_ID in entry["categories"]
+                store.set_schema(app_id, result)
+                return result
+        response = steam_api().call("ISteamUserStats/GetSchemaForGame/v2",
+                                    {"key": self.api_key, "appid": app_id})
+        if response.status == API_FAILED:
+            print(f"Error checking achievements schema for {app_id}: {response.error}")
+            return False   # not stored: worth asking again next time
+        data = response.data or {}
+        result = (
+            "game" in data
+            and "availableGameStats" in data["game"]
+            and "achievements" in data["game"]["availableGameStats"]
+        )
+        store.set_schema(app_id, result)
+        return result
 
+    def get_achievement_progress(self, app_id: str) -> dict:
+        """{"total", "unlocked"} for the configured user; "failed": True is
+        added when the Web API could not answer right now."""
+        store = self.achievement_store()
+        steam_id = self.load_user_id()
+        last_played = self.last_played.get(app_id)
+        known = store.progress(steam_id, app_id, last_played)
+        if known is not None:
+            return known
+        # GetOwnedGames already says whether an owned game has stats; a
+        # GetPlayerAchievements answer implies the schema, so only games we
+        # don't own (family sharing, …) need the separate schema check.
+        if app_id in self.last_played:
+            if app_id not in self.community_stats:
+                return {"total": 0, "unlocked": 0}
+        elif not self.supports_achievements(app_id):
+            return {"total": 0, "unlocked": 0}
+        response = steam_api().call("ISteamUserStats/GetPlayerAchievements/v1", {
+            "key": self.api_key,
+            "steamid": steam_id,
+            "appid": app_id,
+        })
+        result = {"total": 0, "unlocked": 0}
+        if response.status == API_FAILED:
+            print(f"Error fetching achievements for {app_id}: {response.error}")
+            return {**result, "failed": True}   # not stored: asked again next time
+        if response.status == API_UNSUPPORTED:
+            print(f"Skipping achievements for {app_id}: stats not accessible "
+                  f"(HTTP {response.http_status}).")
+        else:
+            playerstats = response.data.get("playerstats") or {}
+            if "achievements" in playerstats:
+                achievements = playerstats["achievements"]
+                result = {
+                    "total": len(achievements),
+                    "unlocked": sum(a["achieved"] for a in achievements),
+                }
+            store.set_schema(app_id, result["total"] > 0)
+        store.set_progress(steam_id, app_id, result, last_played)
+        return result
 
-# ---------------------------------------------------------------------------
-# Shared requests session (reuses TCP connections across all API/image calls)
-# ---------------------------------------------------------------------------
-_session = requests.Session()
-_session.headers.update({"User-Agent": "SteamRoulette/1.0"})
+    # ------------------------------------------------------------------
+    # Spin
+    # ------------------------------------------------------------------
+    def spin_pool(self) -> list:
+        """Games that may be picked: everything in the pool minus exclusions."""
+        excluded = set(self.excluded_games)
+        return [g for g in self.installed_games
+                if "app_id" in g and g["app_id"] not in excluded]
+
+    def pick(self, num_games: int | None = None) -> tuple:
+        """Return (winner, sample) or (None, []) if nothing can be picked.
+
+        sample holds up to num_games games for the spin animation; the winner
+        is drawn from the whole pool, not just the sample.
+        """
+        valid_games = self.spin_pool()
+        if not valid_games:
+            return None, []
+        n = num_games or len(valid_games)
+        sample = random.sample(valid_games, min(n, len(valid_games)))
+        return random.choice(valid_games), sample
+
+
+def game_summary(game: dict, cache_dir: str | None = None) -> dict:
+    """JSON-friendly description of a picked game (used by the CLI)."""
+    app_id = str(game["app_id"])
+    header = os.path.join(cache_dir, f"{app_id}.jpg") if cache_dir else ""
+    return {
+        "app_id": app_id,
+        "name": game.get("name"),
+        "installed": bool(game.get("path") or game.get("shortcut")),
+        "shortcut": bool(game.get("shortcut")),
+        "launch_url": game.get("launch_url") or f"steam://run/{app_id}",
+        "store_url": None if game.get("shortcut")
+        else f"https://store.steampowered.com/app/{app_id}",
+        "header_image": header if header and os.path.exists(header) else None,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -478,6 +3871,158 @@ class ProgressWindow:
                 pass
 
 
+# ---------------------------------------------------------------------------
+# Spin reel
+# ---------------------------------------------------------------------------
+def reel_plan(count: int, width: int, duration_ms: int = ANIMATION_DURATION_MS,
+              frame_ms: int = FRAME_DELAY_MS) -> list:
+    """Strip offset (px) for every animation frame of a count-image reel.
+
+    Cruises at a constant speed sized to fill duration_ms, slows down by
+    SLOWDOWN_FACTOR per frame once the last three images approach, and ends
+    exactly on the last image.
+    """
+    end = (count - 1) * width
+    if end <= 0:
+        return [0]
+    speed = max(20, count * width // max(1, duration_ms // frame_ms))
+    offsets, offset = [], 0.0
+    while offset < end:
+        offset = min(end, offset + speed)
+        offsets.append(offset)
+        if offset >= end - 3 * width:
+            speed = max(MIN_SPEED, speed * SLOWDOWN_FACTOR)
+    return offsets
+
+
+def reel_visible(offset: float, width: int) -> list:
+    """Strip indices on screen at offset: one, or two while between images."""
+    first = int(offset // width)
+    return [first] if offset == first * width else [first, first + 1]
+
+
+class ReelImages:
+    """Lazy, bounded sequence of canvas-sized strip images.
+
+    Images are produced by a small worker pool in `order` (the indices the
+    reel will show, in the order it will show them) and never more than
+    `ahead` positions in front of the reel, so memory does not grow with the
+    number of games. Indices the reel scrolls past too fast to show are never
+    loaded at all.
+    """
+
+    def __init__(self, games: list, loader, order: list, ahead: int = REEL_LOOKAHEAD):
+        self._games = games
+        self._loader = loader
+        self._order = order
+        self._position = {index: pos for pos, index in enumerate(order)}
+        self._ahead = ahead
+        self._ready: dict = {}
+        self._consumed = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        threading.Thread(target=self._produce, daemon=True).start()
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def _load(self, index: int):
+        try:
+            img = self._loader(self._games[index])
+        except Exception as e:
+            print(f"[Spin] Could not prepare image for "
+                  f"{self._games[index].get('name', '?')}: {e}")
+            img = None
+        with self._cond:
+            self._ready[index] = img
+            self._cond.notify_all()
+
+    def _produce(self):
+        with ThreadPoolExecutor(max_workers=REEL_WORKERS) as ex:
+            for pos, index in enumerate(self._order):
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._closed or pos - self._consumed < self._ahead)
+                    if self._closed:
+                        return
+                ex.submit(self._load, index)
+
+    def get(self, index: int, wait: float = 0.0):
+        """The image for index, or None if it is not ready within wait seconds.
+        Marks everything before it in the show order as consumed."""
+        with self._cond:
+            if wait and index not in self._ready:
+                self._cond.wait_for(lambda: index in self._ready or self._closed, wait)
+            img = self._ready.get(index)
+            pos = self._position.get(index)
+            if pos is not None and pos > self._consumed:
+                for done in self._order[self._consumed:pos]:
+                    self._ready.pop(done, None)
+                self._consumed = pos
+                self._cond.notify_all()
+            return img
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._ready.clear()
+            self._cond.notify_all()
+
+
+class SpinReel:
+    """Horizontal spin strip drawn with a fixed ring of REEL_SLOTS canvas items.
+
+    Strip index i is always drawn by slot i % REEL_SLOTS, so neighbouring
+    images never share a slot. A slot's PhotoImage is repainted in place only
+    when the index it shows changes. Per-frame work and memory are constant
+    however long the strip is.
+    """
+
+    def __init__(self, canvas: tk.Canvas, size: tuple, images: ReelImages):
+        self.canvas = canvas
+        self.width, self.height = size
+        self.images = images
+        self._photos = [ImageTk.PhotoImage("RGB", size) for _ in range(REEL_SLOTS)]
+        self._shown = [None] * REEL_SLOTS
+        canvas.delete("all")
+        self._items = [canvas.create_image(0, 0, image=photo, anchor=tk.NW, state="hidden")
+                       for photo in self._photos]
+
+    def _paint(self, index: int, wait: float = 0.0) -> None:
+        slot = index % REEL_SLOTS
+        if self._shown[slot] == index:
+            return
+        img = self.images.get(index, wait)
+        if img is None:
+            return   # not ready yet: keep the slot's previous picture
+        if img.size != (self.width, self.height):
+            img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
+        self._photos[slot].paste(img)
+        self._shown[slot] = index
+
+    def show(self, offset: float, final: bool = False) -> None:
+        """Draw the strip scrolled to offset; final waits for its image."""
+        visible = [i for i in reel_visible(offset, self.width) if i < len(self.images)]
+        for index in visible:
+            self._paint(index, REEL_FINAL_WAIT_S if final else 0.0)
+        slots = {index % REEL_SLOTS: index for index in visible}
+        for slot, item in enumerate(self._items):
+            index = slots.get(slot)
+            if index is None:
+                self.canvas.itemconfigure(item, state="hidden")
+            else:
+                self.canvas.coords(item, index * self.width - offset, 0)
+                self.canvas.itemconfigure(item, state="normal")
+        # Paint the next image into its (hidden) slot ahead of time
+        upcoming = visible[-1] + 1 if visible else None
+        if upcoming is not None and upcoming < len(self.images) \
+                and upcoming % REEL_SLOTS not in slots:
+            self._paint(upcoming)
+
+    def close(self) -> None:
+        self.images.close()
+
+
 # ---------------------------------------------------------------------------
 # GUI
 # ---------------------------------------------------------------------------
@@ -613,23 +4158,23 @@ class LogWindow:
 
 
 class SteamRouletteGUI:
-    def __init__(self, root: tk.Tk, installed_games: list, drives: list):
+    """Tk front end; all game-pool state lives in the SteamRouletteEngine."""
+
+    def __init__(self, root: tk.Tk, engine: SteamRouletteEngine):
         self.root = root
-        self.installed_games = installed_games
-        self.excluded_games: list = []
-        self.uninstalled_games: list = []
+        self.engine = engine
         self.selected_game: dict | None = None
-        self.drives = drives
-        self.cache_dir = create_cache_directory()
-        self.api_key: str = self._load_text_file("apikey.txt")
         self.is_dark_mode: bool = False
         self.selected_num_games: int | None = None
         self.is_images_preloaded: bool = False
         self.active_images: list = []
+        self.reel: SpinReel | None = None
         self.selected_game_image: Image.Image | None = None
         self.selected_game_item = None
         self.animation_id = None
-        self.preloaded_images: dict = {}
+        self.is_library_loaded: bool = False
+        self.is_pool_ready: bool = False      # MIN_SPIN_POOL games have streamed in
+        self.has_first_header: bool = False
 
         # Log window — created early so all subsequent print() calls are captured
         self.log_window = LogWindow(self.root)
@@ -641,30 +4186,21 @@ class SteamRouletteGUI:
         self.dark_mode_fg  = "#ffffff"
 
         # Animation state
-        self.initial_animation_speed = 50
-        self.animation_speed = 200
         self.frame_delay = FRAME_DELAY_MS
 
         self._build_ui()
-        self.load_exclusions()
-        # Pre-load installed-game images in the background; UI stays responsive
-        threading.Thread(target=self._preload_installed_images, daemon=True).start()
-        # Fetch icon hashes for installed games from the Steam API in the background
-        threading.Thread(target=self._fetch_icon_hashes, daemon=True).start()
-
-    # ------------------------------------------------------------------
-    # File I/O helpers
-    # ------------------------------------------------------------------
-    def _load_text_file(self, filename: str) -> str:
-        path = _data_path(filename)
-        if os.path.exists(path):
-            with open(path, "r") as fh:
-                return fh.read().strip()
-        return ""
-
-    def _save_text_file(self, filename: str, content: str) -> None:
-        with open(_data_path(filename), "w") as fh:
-            fh.write(content)
+        self.engine.load_exclusions()
+        # The window is up before any manifest has been read; the library
+        # streams in from a background scan (see _on_library_batch)
+        self.button_spin.config(state=tk.DISABLED, text="Loading library…")
+        self.include_uninstalled_checkbox.config(state=tk.DISABLED)
+        self.filter_achievements_checkbox.config(state=tk.DISABLED)
+        self.please_wait_label.config(text="Scanning Steam libraries…")
+        if self.engine.installed_games:
+            # Restored from the warm-start snapshot: usable before the scan ends
+            self.include_uninstalled_var.set(bool(self.engine.uninstalled_games))
+            self._on_library_batch([])
+        threading.Thread(target=self._scan_library, daemon=True).start()
 
     # ------------------------------------------------------------------
     # UI construction
@@ -760,8 +4296,6 @@ class SteamRouletteGUI:
         # ── Canvas (game art strip) ──────────────────────────────────
         self.canvas = tk.Canvas(self.root, width=600, height=300, bg="black")
         self.canvas.pack(pady=0)
-        self.root.update_idletasks()
-        self.display_random_header_image()
 
         # ── Spin / launch / store buttons ────────────────────────────
         utility_frame = tk.Frame(self.root, bg=bg)
@@ -803,7 +4337,7 @@ class SteamRouletteGUI:
         self.button_exclude.grid(row=2, column=1, pady=2)
 
         self.excluded_label = tk.Label(
-            self.frame_controls, text=f"Excluded Games:\n{len(self.excluded_games)}",
+            self.frame_controls, text=f"Excluded Games:\n{len(self.engine.excluded_games)}",
             font=("Arial", 8), bg=bg, fg=fg)
         self.excluded_label.grid(row=3, column=1, pady=2)
 
@@ -862,72 +4396,112 @@ class SteamRouletteGUI:
         self.set_light_mode()
 
     # ------------------------------------------------------------------
-    # Image pre-loading
+    # Startup library scan
     # ------------------------------------------------------------------
-    def _fetch_icon_hashes(self):
-        """Silently fetch img_icon_url for installed games from the Steam API
-        and merge them into self.installed_games so the Exclude popup can show icons
-        even when uninstalled games haven't been loaded."""
-        api_key = self.api_key
-        user_id = self._load_text_file("steamuserid.txt")
-        if not api_key or not user_id:
-            return  # not configured yet — skip silently
-
-        try:
-            all_games = get_all_games(api_key, user_id)
-        except Exception as e:
-            print(f"Could not fetch icon hashes: {e}")
-            return
-
-        if not all_games:
+    def _scan_library(self):
+        """Background worker: stream the installed library into the pool."""
+        scanned = self.engine.scan(on_batch=lambda games: self.root.after(
+            0, self._on_library_batch, games))
+        self.root.after(0, self._on_library_scanned, scanned)
+
+    def _on_library_batch(self, games: list):
+        """Merge a batch of scanned games (main thread only)."""
+        self.engine.apply_library_delta(games, [], announce=False)
+        self.label_game_count.config(text=self._games_found_text())
+        if not self.has_first_header:
+            self.has_first_header = True
+            self.display_random_header_image()
+        if not self.is_pool_ready and len(self.engine.spin_pool()) >= MIN_SPIN_POOL:
+            self.is_pool_ready = True
+            self.button_spin.config(state=tk.NORMAL, text="Spin the Wheel")
+
+    def _on_library_scanned(self, scanned: list):
+        """The startup scan is complete: start the follow-up background work."""
+        self.is_library_loaded = True
+        if self.engine.reconcile_scan(scanned):
+            self.label_game_count.config(text=self._games_found_text())
+        self.please_wait_label.config(text="")
+        self.include_uninstalled_checkbox.config(state=tk.NORMAL)
+        self.filter_achievements_checkbox.config(state=tk.NORMAL)
+        if not self.is_pool_ready:
+            self.is_pool_ready = True
+            self.button_spin.config(state=tk.NORMAL, text="Spin the Wheel")
+        print(f"[Library] {len(self.engine.installed_games)} game(s) in the pool.")
+        if not self.engine.installed_games:
+            self.button_spin.config(state=tk.DISABLED)
+            messagebox.showerror("Steam Roulette", "No installed Steam games found.")
             return
+        self.start_library_watcher()
+        # Pre-load installed-game images in the background; UI stays responsive
+        threading.Thread(target=self._preload_installed_images, daemon=True).start()
+        # Fetch icon hashes for installed games from the Steam API in the background
+        threading.Thread(target=self._fetch_icon_hashes, daemon=True).start()
+        if self.engine.uninstalled_games:
+            threading.Thread(target=self._refresh_uninstalled, daemon=True).start()
 
-        # Build a lookup: appid (str) → img_icon_url
-        hash_map = {
-            str(g["appid"]): g.get("img_icon_url", "")
-            for g in all_games
-            if "appid" in g and g.get("img_icon_url")
-        }
+    def _refresh_uninstalled(self):
+        """Background worker: re-fetch the uninstalled list a snapshot restored."""
+        fresh = self.engine.fetch_uninstalled_games()
+        if fresh is not None:
+            self.root.after(0, self._apply_uninstalled_refresh, fresh)
 
-        # Merge into installed_games in-place (thread-safe: only writing new keys)
-        for game in self.installed_games:
-            app_id = str(game["app_id"])
-            if app_id in hash_map and not game.get("img_icon_url"):
-                game["img_icon_url"] = hash_map[app_id]
+    def _apply_uninstalled_refresh(self, fresh: list):
+        if not self.include_uninstalled_var.get():
+            return  # switched off while the request was in flight
+        self.engine.replace_uninstalled(fresh)
+        print(f"[Snapshot] Uninstalled list refreshed: {len(fresh)} game(s).")
 
-        print(f"Icon hashes merged for {len(hash_map)} games.")
+    # ------------------------------------------------------------------
+    # Image pre-loading
+    # ------------------------------------------------------------------
+    def _fetch_icon_hashes(self):
+        """Background worker: merge icon hashes into the pool so the Exclude
+        popup can show icons. Steam's local appinfo cache usually covers every
+        installed game; the Web API is only asked when it does not."""
+        covered, non_games = self.engine.apply_local_appinfo()
+        if non_games:
+            self.root.after(0, self.apply_library_delta, [], non_games)
+        if not covered:
+            self.engine.fetch_icon_hashes()
 
     def _preload_installed_images(self):
         """Background worker: fetch header images for all installed games."""
-        def _load(game):
-            app_id = game.get("app_id")
-            if not app_id:
-                return
-            with _image_lock:
-                already = app_id in self.preloaded_images
-            if already:
-                return
-            img = fetch_header_image(app_id, self.cache_dir,
-                                     game_name=game.get("name", ""))
-            with _image_lock:
-                self.preloaded_images[app_id] = img
-
-        with ThreadPoolExecutor(max_workers=PRELOAD_WORKERS) as ex:
-            ex.map(_load, self.installed_games)
-
+        self.engine.preload_images(list(self.engine.installed_games))
         self.root.after(0, self._on_installed_images_ready)
 
     def _on_installed_images_ready(self):
         self.is_images_preloaded = True
         print("Installed-game images pre-loaded.")
+        print(f"[Image] Sources so far: {image_source_summary()}")
+        print(f"[Image] Memory cache: {self.engine.images.summary()}")
+        print(f"[Download] Host response times: {url_ranking().host_summary() or 'none yet'}")
+        threading.Thread(target=self.engine.revalidate_images,
+                         name="ImageRevalidate", daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # Live library updates
+    # ------------------------------------------------------------------
+    def start_library_watcher(self):
+        """Watch the Steam libraries and apply install/uninstall deltas live."""
+        self.engine.start_watcher(
+            on_change=lambda updated, removed: self.root.after(
+                0, self.apply_library_delta, updated, removed))
+
+    def apply_library_delta(self, updated: list, removed: list):
+        """Merge library changes into the spin pool (main thread only)."""
+        new_games = self.engine.apply_library_delta(updated, removed)
+        if new_games:
+            threading.Thread(target=self.engine.preload_images,
+                             args=(new_games,), daemon=True).start()
+        self.label_game_count.config(text=self._games_found_text())
 
     def load_images_in_parallel(self, pw: "ProgressWindow | None" = None):
         """Download header images for uninstalled games, skipping any already cached."""
-        all_games = list(self.uninstalled_games)
+        all_games = list(self.engine.uninstalled_games)
 
         # Filter to only games whose image isn't already on disk
         def _is_cached(game) -> bool:
-            cache_file = os.path.join(self.cache_dir, f"{game['app_id']}.jpg")
+            cache_file = os.path.join(self.engine.cache_dir, f"{game['app_id']}.jpg")
             return os.path.exists(cache_file)
 
         games_to_fetch = [g for g in all_games if not _is_cached(g)]
@@ -960,24 +4534,14 @@ class SteamRouletteGUI:
             self.root.after(0, _nothing_to_do)
             return
 
-        completed = 0
-        lock = threading.Lock()
-
-        def _load_one(game):
-            nonlocal completed
-            fetch_header_image(game["app_id"], self.cache_dir,
-                               game_name=game.get("name", ""))
-            with lock:
-                completed += 1
-                c = completed
-            def _upd(c=c):
+        def _progress(c, total):
+            def _upd():
                 self.please_wait_label.config(text=f"Downloading… {c}/{total}")
                 if pw_holder[0]:
                     pw_holder[0].update(c, f"Downloading images… {c} of {total}")
             self.root.after(0, _upd)
 
-        with ThreadPoolExecutor(max_workers=PRELOAD_WORKERS) as ex:
-            ex.map(_load_one, games_to_fetch)
+        self.engine.preload_images(games_to_fetch, on_progress=_progress)
 
         def _finish():
             if pw_holder[0]:
@@ -993,62 +4557,51 @@ class SteamRouletteGUI:
         self.filter_achievements_checkbox.config(state=tk.NORMAL)
         self.please_wait_label.config(text="")
         print("Uninstalled-game images loaded and cached.")
+        print(f"[Image] Sources so far: {image_source_summary()}")
     # ------------------------------------------------------------------
     # Text helpers
     # ------------------------------------------------------------------
     def _games_found_text(self) -> str:
+        counts: dict = {}
+        for game in self.engine.installed_games:
+            if game.get("path"):
+                drive = drive_of(game["path"])
+                counts[drive] = counts.get(drive, 0) + 1
         lines = ["Installed\nGames Found:"]
-        for drive in self.drives:
-            count = sum(1 for g in self.installed_games if g.get("path", "").startswith(drive))
-            lines.append(f"{drive} {count} games")
+        lines += [f"{drive} {count} games" for drive, count in sorted(counts.items())]
         return "\n".join(lines)
 
     # ------------------------------------------------------------------
     # API key & Steam User ID
     # ------------------------------------------------------------------
     def load_api_key(self) -> str:
-        return self._load_text_file("apikey.txt")
+        return self.engine.api_key
 
     def set_api_key(self):
         self._string_input_popup(
             title="Enter API Key",
             prompt="Please enter your Steam API Key:",
             on_submit=lambda v: (
-                self._save_text_file("apikey.txt", v),
-                setattr(self, "api_key", v),
+                self.engine.set_api_key(v),
                 messagebox.showinfo("API Key", "API Key saved successfully."),
             ),
         )
 
     def load_user_id_key(self) -> str:
-        return self._load_text_file("steamuserid.txt")
+        return self.engine.load_user_id()
 
     def set_user_id_key(self):
         self._string_input_popup(
             title="Enter Steam User ID",
             prompt="Please enter your Steam User ID:",
             on_submit=lambda v: (
-                self._save_text_file("steamuserid.txt", v),
+                self.engine.save_user_id(v),
                 messagebox.showinfo("Success", "Steam User ID saved successfully."),
             ),
         )
 
     def save_user_id_key(self, user_id: str):
-        self._save_text_file("steamuserid.txt", user_id)
-
-    def fetch_steam_user_id(self, api_key: str, steam_id: str) -> str | None:
-        """Verify a Steam ID via the Web API and return it (or None on failure)."""
-        url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
-        try:
-            resp = _session.get(url, params={"key": api_key, "steamids": steam_id}, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            players = data.get("response", {}).get("players", [])
-            if players:
-                return players[0].get("steamid")
-        except Exception as e:
-            print(f"Error fetching Steam User ID: {e}")
-        return None
+        self.engine.save_user_id(user_id)
 
     # ------------------------------------------------------------------
     # Generic popup helper (replaces three nearly-identical popups)
@@ -1118,7 +4671,7 @@ class SteamRouletteGUI:
     # ------------------------------------------------------------------
     def toggle_uninstalled_games(self):
         if self.include_uninstalled_var.get():
-            if not self.api_key:
+            if not self.engine.api_key:
                 messagebox.showerror("Error", "Please set your Steam API key first.")
                 self.include_uninstalled_var.set(False)
                 return
@@ -1137,11 +4690,7 @@ class SteamRouletteGUI:
                 target=self._fetch_uninstalled_in_background,
                 args=(pw,), daemon=True).start()
         else:
-            if self.uninstalled_games:
-                uninstalled_ids = {g["app_id"] for g in self.uninstalled_games}
-                self.installed_games = [g for g in self.installed_games
-                                        if g["app_id"] not in uninstalled_ids]
-                self.uninstalled_games = []
+            if self.engine.remove_uninstalled():
                 messagebox.showinfo("Uninstalled Games Removed",
                                     "Uninstalled games removed from the spin pool.")
 
@@ -1157,8 +4706,8 @@ class SteamRouletteGUI:
 
         # Stage 1: fetch full game list (indeterminate — unknown duration)
         self.root.after(0, lambda: pw.set_text("Fetching your Steam library…"))
-        all_games = get_all_games(self.api_key, user_id)
-        if not all_games:
+        new_uninstalled = self.engine.fetch_uninstalled_games()
+        if new_uninstalled is None:
             self.root.after(0, pw.close)
             self.root.after(0, lambda: messagebox.showerror(
                 "Error", "No games were fetched from the Steam API."))
@@ -1166,30 +4715,15 @@ class SteamRouletteGUI:
             self.root.after(0, self.enable_checkbox)
             return
 
-        # Stage 2: filter to uninstalled only (instant, but update label)
-        self.root.after(0, lambda: pw.set_text("Filtering uninstalled games…"))
-        installed_ids = {str(g["app_id"]) for g in self.installed_games}
-        new_uninstalled = [
-            {
-                "app_id": str(g["appid"]),
-                "name": (g.get("name") or f"App {g['appid']}").strip(),
-                "img_icon_url": g.get("img_icon_url", ""),
-            }
-            for g in all_games
-            if "appid" in g
-            and str(g["appid"]) not in installed_ids
-            and str(g["appid"]) not in NON_GAME_APP_IDS
-        ]
-
         def _apply():
             if new_uninstalled:
-                self.uninstalled_games = new_uninstalled
-                self.installed_games.extend(new_uninstalled)
-                # Stage 3: hand the progress window to the image loader
+                self.engine.add_uninstalled(new_uninstalled)
+                # Stage 2: hand the progress window to the image loader
                 pw.switch_to_determinate(len(new_uninstalled),
                                          f"Downloading images… 0 of {len(new_uninstalled)}")
                 if self.filter_achievements_var.get():
-                    self.exclude_achievement_games()
+                    threading.Thread(target=self.exclude_achievement_games,
+                                     daemon=True).start()
                 threading.Thread(
                     target=self.load_images_in_parallel,
                     args=(pw,), daemon=True).start()
@@ -1219,57 +4753,46 @@ class SteamRouletteGUI:
     def _exclude_achievements_bg(self):
         self.exclude_achievement_games()
         self.root.after(0, lambda: self.excluded_label.config(
-            text=f"Excluded Games:\n{len(self.excluded_games)}"))
-        self.root.after(0, self.save_exclusions)
+            text=f"Excluded Games:\n{len(self.engine.excluded_games)}"))
+        self.root.after(0, self.engine.save_exclusions)
         self.root.after(0, self.enable_checkbox)
 
     def _include_achievements_bg(self):
-        self.include_achievement_games()
+        self._run_achievement_check("Restoring Achieved Games",
+                                    self.engine.include_achievement_games)
         self.root.after(0, lambda: self.excluded_label.config(
-            text=f"Excluded Games:\n{len(self.excluded_games)}"))
-        self.root.after(0, self.save_exclusions)
+            text=f"Excluded Games:\n{len(self.engine.excluded_games)}"))
+        self.root.after(0, self.engine.save_exclusions)
         self.root.after(0, self.enable_checkbox)
 
     def exclude_achievement_games(self):
-        all_games = list({g["app_id"]: g for g in
-                          self.installed_games + self.uninstalled_games}.values())
-        total = len(all_games)
-        completed = 0
-        lock = threading.Lock()
+        """Run the engine's achievement filter behind a progress window (blocking)."""
+        self._run_achievement_check("Checking Achievements", self.engine.exclude_achievement_games)
 
+    def _run_achievement_check(self, title: str, run):
+        """Run an engine achievement pass (exclude or include) behind a
+        progress window; blocks the calling worker thread until done."""
         pw_holder = [None]
 
         def _open_pw():
-            pw_holder[0] = ProgressWindow(self.root, "Checking Achievements", total,
+            # Indeterminate until the engine reports how many games it checks
+            pw_holder[0] = ProgressWindow(self.root, title, 0,
                                           bg=self.dark_mode_bg if self.is_dark_mode else self.light_mode_bg,
                                           fg=self.dark_mode_fg if self.is_dark_mode else self.light_mode_fg)
 
         self.root.after(0, _open_pw)
         import time as _time; _time.sleep(0.05)
 
-        def _check(game):
-            nonlocal completed
-            app_id = str(game["app_id"])
-            try:
-                if not self.supports_achievements(app_id):
-                    return
-                progress = self.get_achievement_progress(app_id)
-                if progress["total"] > 0 and progress["unlocked"] == progress["total"]:
-                    with lock:
-                        if app_id not in self.excluded_games:
-                            self.excluded_games.append(app_id)
-            finally:
-                with lock:
-                    completed += 1
-                    c = completed
-                def _upd(c=c):
-                    self.please_wait_label.config(text=f"Checking… {c}/{total}")
-                    if pw_holder[0]:
-                        pw_holder[0].update(c, f"Checking achievements… {c} of {total}")
-                self.root.after(0, _upd)
+        def _progress(c, total):
+            def _upd():
+                self.please_wait_label.config(text=f"Checking… {c}/{total}")
+                if pw_holder[0]:
+                    if pw_holder[0].total != total:
+                        pw_holder[0].switch_to_determinate(total)
+                    pw_holder[0].update(c, f"Checking achievements… {c} of {total}")
+            self.root.after(0, _upd)
 
-        with ThreadPoolExecutor(max_workers=8) as ex:
-            ex.map(_check, all_games)
+        run(on_progress=_progress)
 
         def _finish():
             if pw_holder[0]:
@@ -1277,75 +4800,6 @@ class SteamRouletteGUI:
 
         self.root.after(0, _finish)
 
-    def include_achievement_games(self):
-        """Remove 100%-complete achievement games from the excluded list."""
-        to_remove = []
-        for app_id in list(self.excluded_games):
-            progress = self.get_achievement_progress(app_id)
-            total = progress["total"]
-            if total > 0 and progress["unlocked"] == total:
-                to_remove.append(app_id)
-        for app_id in to_remove:
-            self.excluded_games.remove(app_id)
-
-    # Cache schema lookups so each app_id is only queried once per session
-    _achievement_schema_cache: dict = {}
-    _achievement_progress_cache: dict = {}
-
-    def supports_achievements(self, app_id: str) -> bool:
-        if app_id in self._achievement_schema_cache:
-            return self._achievement_schema_cache[app_id]
-        url = "https://api.steampowered.com/ISteamUserStats/GetSchemaForGame/v2/"
-        try:
-            resp = _session.get(url, params={"key": self.api_key, "appid": app_id}, timeout=10)
-            if resp.status_code in (400, 403):
-                self._achievement_schema_cache[app_id] = False
-                return False
-            resp.raise_for_status()
-            data = resp.json()
-            result = (
-                "game" in data
-                and "availableGameStats" in data["game"]
-                and "achievements" in data["game"]["availableGameStats"]
-            )
-        except Exception as e:
-            print(f"Error checking achievements schema for {app_id}: {e}")
-            result = False
-        self._achievement_schema_cache[app_id] = result
-        return result
-
-    def get_achievement_progress(self, app_id: str) -> dict:
-        if app_id in self._achievement_progress_cache:
-            return self._achievement_progress_cache[app_id]
-        if not self.supports_achievements(app_id):
-            return {"total": 0, "unlocked": 0}
-        url = "https://api.steampowered.com/ISteamUserStats/GetPlayerAchievements/v1/"
-        params = {
-            "key": self.api_key,
-            "steamid": self.load_user_id_key(),
-            "appid": app_id,
-        }
-        result = {"total": 0, "unlocked": 0}
-        try:
-            resp = _session.get(url, params=params, timeout=10)
-            if resp.status_code in (400, 403):
-                print(f"Skipping achievements for {app_id}: stats not accessible (HTTP {resp.status_code}).")
-            else:
-                resp.raise_for_status()
-                data = resp.json()
-                if "playerstats" in data and "achievements" in data["playerstats"]:
-                    achievements = data["playerstats"]["achievements"]
-                    result = {
-                        "total": len(achievements),
-                        "unlocked": sum(a["achieved"] for a in achievements),
-                    }
-        except requests.exceptions.HTTPError as e:
-            print(f"HTTP error fetching achievements for {app_id}: {e}")
-        except Exception as e:
-            print(f"Error fetching achievements for {app_id}: {e}")
-        self._achievement_progress_cache[app_id] = result
-        return result
-
     def enable_checkbox(self):
         self.include_uninstalled_checkbox.config(state=tk.NORMAL)
         self.filter_achievements_checkbox.config(state=tk.NORMAL)
@@ -1357,39 +4811,12 @@ class SteamRouletteGUI:
     # ------------------------------------------------------------------
     def clear_image_cache(self):
         """Delete all cached images so they are re-fetched on next use."""
-        count = 0
-        for f in os.listdir(self.cache_dir):
-            if f.endswith(".jpg"):
-                try:
-                    os.remove(os.path.join(self.cache_dir, f))
-                    count += 1
-                except OSError as e:
-                    print(f"Could not delete {f}: {e}")
-        with _image_lock:
-            self.preloaded_images.clear()
+        count = self.engine.clear_image_cache()
         messagebox.showinfo("Cache Cleared", f"Deleted {count} cached image(s). They will be re-downloaded as needed.")
 
-    def load_exclusions(self):
-        path = _data_path("excluded_games.json")
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as fh:
-                    self.excluded_games = json.load(fh)
-                print(f"Loaded {len(self.excluded_games)} exclusions.")
-            except Exception as e:
-                print(f"Error loading exclusions: {e}")
-
-    def save_exclusions(self):
-        try:
-            with open(_data_path("excluded_games.json"), "w") as fh:
-                json.dump(self.excluded_games, fh)
-        except Exception as e:
-            print(f"Error saving exclusions: {e}")
-
     def clear_exclusions(self):
-        self.excluded_games = []
+        self.engine.set_exclusions([])
         self.excluded_label.config(text=f"Excluded Games:\n0")
-        self.save_exclusions()
         messagebox.showinfo("Cleared", "All exclusions have been cleared.")
         # Rebuild the checklist in the open popup if it exists
         if hasattr(self, "exclude_popup") and self.exclude_popup.winfo_exists():
@@ -1407,7 +4834,6 @@ class SteamRouletteGUI:
         check_bg  = "#4a90d9"   # tick colour
         hover_bg  = "#3a3a5a" if self.is_dark_mode else "#e8eaf6"
         ROW_H     = 28          # px per row
-        ICON_SIZE = 20
         ICON_X    = 6           # left edge of icon
         CHECK_X   = 32          # left edge of checkbox square
         TEXT_X    = 54          # left edge of game name text
@@ -1441,11 +4867,12 @@ class SteamRouletteGUI:
         btn_row.pack(fill="x", padx=8, pady=(2, 4))
 
         def _apply():
-            self.excluded_games = [aid for aid, checked in checked_state.items() if checked]
-            self.excluded_label.config(text=f"Excluded Games:\n{len(self.excluded_games)}")
-            self.save_exclusions()
+            self.engine.set_exclusions(
+                [aid for aid, checked in checked_state.items() if checked])
+            self.excluded_label.config(
+                text=f"Excluded Games:\n{len(self.engine.excluded_games)}")
             messagebox.showinfo("Exclusions Applied",
-                                f"Excluded {len(self.excluded_games)} games.")
+                                f"Excluded {len(self.engine.excluded_games)} games.")
 
         tk.Button(btn_row, text="Apply", command=_apply,
                   bg=bg, fg=fg, font=("Arial", 10)).pack(side="left", padx=(0, 4))
@@ -1471,8 +4898,8 @@ class SteamRouletteGUI:
 
         # ── State ────────────────────────────────────────────────────
         # checked_state: app_id → bool (persists across repaints)
-        checked_state: dict = {str(g["app_id"]): (str(g["app_id"]) in self.excluded_games)
-                               for g in self.installed_games}
+        checked_state: dict = {str(g["app_id"]): (str(g["app_id"]) in self.engine.excluded_games)
+                               for g in self.engine.installed_games}
         # icon cache: app_id → PhotoImage (kept alive here)
         icon_cache: dict = {}
         cancel_token = [0]
@@ -1480,7 +4907,7 @@ class SteamRouletteGUI:
 
         def _all_games_sorted():
             return sorted(
-                [g for g in self.installed_games if str(g.get("name", "")).strip()],
+                [g for g in self.engine.installed_games if str(g.get("name", "")).strip()],
                 key=lambda g: g["name"].lower()
             )
 
@@ -1535,7 +4962,7 @@ class SteamRouletteGUI:
             for g in games:
                 aid = str(g["app_id"])
                 if aid not in checked_state:
-                    checked_state[aid] = aid in self.excluded_games
+                    checked_state[aid] = aid in self.engine.excluded_games
 
             width = c.winfo_width() or 620
             total_h = len(games) * ROW_H
@@ -1551,60 +4978,69 @@ class SteamRouletteGUI:
             def _load_icons():
                 if not missing:
                     return
-                total_missing = len(missing)
                 result_queue: queue.Queue = queue.Queue()
-                lock = threading.Lock()
-                fetched = [0]
 
-                def _fetch_one(game):
+                def _decode(game):
                     if cancel_token[0] != my_token:
                         return
-                    app_id = str(game["app_id"])
-                    icon_hash = game.get("img_icon_url", "")
-                    pil_img = fetch_game_icon(
-                        app_id, icon_hash, self.cache_dir, size=ICON_SIZE,
-                        game_name=game.get("name", ""))
-                    with lock:
-                        fetched[0] += 1
+                    # Downloads have already landed in the cache by now
+                    pil_img = self.engine.get_icon(game)
                     if cancel_token[0] == my_token:
-                        result_queue.put((app_id, pil_img, fetched[0]))
-
-                # Fetch all icons in background threads
-                fetch_thread = threading.Thread(
-                    target=lambda: ThreadPoolExecutor(
-                        max_workers=PRELOAD_WORKERS).__enter__().map(
-                            _fetch_one, missing),
-                    daemon=True)
+                        result_queue.put((str(game["app_id"]), pil_img, 0))
+
+                def _fetch_all():
+                    # Icons already in the atlas go straight to the queue; the
+                    # rest are queued on the shared async Downloader (or decoded
+                    # straight away when on disk) and packed as they arrive
+                    pending = {}
+                    for game in missing:
+                        pil_img = self.engine.cached_icon(game)
+                        if pil_img is not None:
+                            result_queue.put((str(game["app_id"]), pil_img, 0))
+                            continue
+                        future = self.engine.prefetch_icon(game)
+                        if future is None:
+                            _decode(game)
+                        else:
+                            pending[future] = game
+                    for future in as_completed(pending):
+                        if cancel_token[0] != my_token:
+                            return
+                        _decode(pending[future])
+                    self.engine.save_caches()
+
+                fetch_thread = threading.Thread(target=_fetch_all, daemon=True)
                 fetch_thread.start()
 
-                # Drain the queue one item per after() tick so user events
-                # always have priority between injections
+                # Drain the queue in slices of at most ~8 ms per after() tick so
+                # user events always get a turn between injections
+                row_of = {str(g["app_id"]): i for i, g in enumerate(current_filtered)}
+
                 def _drain():
                     if cancel_token[0] != my_token:
                         return
-                    try:
-                        app_id, pil_img, n = result_queue.get_nowait()
-                        if pil_img:
-                            try:
-                                photo = ImageTk.PhotoImage(pil_img)
-                                icon_cache[app_id] = photo
-                                for i, g in enumerate(current_filtered):
-                                    if str(g["app_id"]) == app_id:
-                                        y = i * ROW_H
-                                        c.delete(f"icon_ph_{app_id}")
-                                        c.delete(f"icon_{app_id}")
-                                        c.create_image(ICON_X, y + 4,
-                                                       image=photo, anchor="nw",
-                                                       tags=(f"icon_{app_id}",))
-                                        break
-                            except tk.TclError:
-                                pass
-                    except queue.Empty:
-                        pass  # nothing ready yet — come back next tick
+                    deadline = time.perf_counter() + 0.008
+                    while time.perf_counter() < deadline:
+                        try:
+                            app_id, pil_img, n = result_queue.get_nowait()
+                        except queue.Empty:
+                            break  # nothing ready yet — come back next tick
+                        if not pil_img or app_id not in row_of:
+                            continue
+                        try:
+                            photo = ImageTk.PhotoImage(pil_img)
+                            icon_cache[app_id] = photo
+                            c.delete(f"icon_ph_{app_id}")
+                            c.delete(f"icon_{app_id}")
+                            c.create_image(ICON_X, row_of[app_id] * ROW_H + 4,
+                                           image=photo, anchor="nw",
+                                           tags=(f"icon_{app_id}",))
+                        except tk.TclError:
+                            pass
 
                     # Keep draining until all fetches are done and queue is empty
                     if fetch_thread.is_alive() or not result_queue.empty():
-                        c.after(20, _drain)  # 20 ms gap = ~50 injects/sec max
+                        c.after(20, _drain)
 
                 c.after(20, _drain)
 
@@ -1692,14 +5128,15 @@ class SteamRouletteGUI:
         def _submit():
             try:
                 n = int(entry.get())
-                if n < 1 or n > len(self.installed_games):
+                if n < 1 or n > len(self.engine.installed_games):
                     raise ValueError
                 self.selected_num_games = n
                 self.label_number_of_games.config(text=f"Number selected:\n{n}")
-                self.button_spin.config(state=tk.NORMAL, text="Spin the Wheel")
+                if self.is_pool_ready:
+                    self.button_spin.config(state=tk.NORMAL, text="Spin the Wheel")
                 popup.destroy()
             except ValueError:
-                tk.Label(popup, text=f"Enter a number 1–{len(self.installed_games)}",
+                tk.Label(popup, text=f"Enter a number 1–{len(self.engine.installed_games)}",
                          fg="red", bg=bg).pack()
 
         tk.Button(popup, text="Submit", command=_submit, bg=bg, fg=fg).pack(pady=10)
@@ -1708,54 +5145,59 @@ class SteamRouletteGUI:
     # Canvas image display
     # ------------------------------------------------------------------
     def display_random_header_image(self):
-        if not self.installed_games:
+        """Show a random game's header once it has been resolved off the main
+        thread (a cold cache can mean several CDN round-trips)."""
+        if not self.engine.installed_games:
             return
-        game = random.choice(self.installed_games)
-        img = fetch_header_image(game["app_id"], self.cache_dir,
-                                 game_name=game.get("name", ""))
-        self._display_image_on_canvas(img)
-        self.canvas.update_idletasks()
+        game = random.choice(self.engine.installed_games)
+        size = self._canvas_size()
+
+        def _resolve():
+            img = self.engine.get_scaled_image(game, size)
+            self.root.after(0, _show, img)
+
+        def _show(img):
+            # A spin that started meanwhile owns the canvas
+            if self.selected_game is None and not self.active_images:
+                self._display_image_on_canvas(img)
+
+        threading.Thread(target=_resolve, daemon=True).start()
+
+    def _canvas_size(self) -> tuple:
+        """Canvas size in pixels (its configured size until it is first drawn)."""
+        cw, ch = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if cw <= 1 or ch <= 1:
+            cw, ch = int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+        return cw, ch
 
     def _display_image_on_canvas(self, img: Image.Image):
-        self.canvas.update_idletasks()
-        cw = self.canvas.winfo_width() or 600
-        ch = self.canvas.winfo_height() or 300
-        img_resized = img.resize((cw, ch), Image.Resampling.LANCZOS)
-        img_tk = ImageTk.PhotoImage(img_resized)
+        """Show an image already scaled to the canvas (see get_scaled_image)."""
+        cw, ch = self._canvas_size()
+        if img.size != (cw, ch):
+            # The canvas changed size since the image was scaled
+            img = img.resize((cw, ch), Image.Resampling.LANCZOS)
+        img_tk = ImageTk.PhotoImage(img)
         self.canvas.delete("all")
         self.canvas.create_image(cw // 2, ch // 2, image=img_tk, anchor=tk.CENTER)
-        self.active_images = [(img_tk, img_resized)]
+        self.active_images = [(img_tk, img)]
 
     def load_image(self, app_id: str) -> Image.Image:
-        with _image_lock:
-            img = self.preloaded_images.get(app_id)
-        if not img:
-            name = next((g.get("name", "") for g in self.installed_games
-                         if str(g["app_id"]) == str(app_id)), "")
-            img = fetch_header_image(app_id, self.cache_dir, game_name=name)
-            with _image_lock:
-                self.preloaded_images[app_id] = img
-        cw = self.canvas.winfo_width() or 600
-        ch = self.canvas.winfo_height() or 300
-        return img.resize((cw, ch), Image.Resampling.LANCZOS)
+        """Canvas-sized header for app_id (blocking on a rendition-cache miss,
+        so call it off the main thread)."""
+        game = next((g for g in self.engine.installed_games
+                     if str(g["app_id"]) == str(app_id)), {"app_id": app_id})
+        return self.engine.get_scaled_image(game, self._canvas_size())
 
     # ------------------------------------------------------------------
     # Spin logic
     # ------------------------------------------------------------------
     def spin_wheel(self):
-        valid_games = [
-            g for g in self.installed_games
-            if "app_id" in g and g["app_id"] not in self.excluded_games
-        ]
-        if not valid_games:
+        # The winner is picked from the full valid pool (not just the sample)
+        winner, sample = self.engine.pick(self.selected_num_games)
+        if winner is None:
             messagebox.showerror("Error", "No valid games available to spin.")
             return
-
-        n = self.selected_num_games or len(valid_games)
-        sample = random.sample(valid_games, min(n, len(valid_games)))
-
-        # Pick the winner from the full valid pool (not just the sample)
-        self.selected_game = random.choice(valid_games)
+        self.selected_game = winner
         print(f"Winner: {self.selected_game['name']} (app_id: {self.selected_game['app_id']})")
 
         self.button_spin.config(state=tk.DISABLED, text="Loading…")
@@ -1763,154 +5205,192 @@ class SteamRouletteGUI:
         self.button_store.config(state=tk.DISABLED)
         self.label_welcome.config(text="Loading images…")
 
-        # Build the full list of games that need to appear in the animation
-        games_to_draw = list(sample)
-        if self.selected_game not in games_to_draw:
-            games_to_draw.append(self.selected_game)
-
-        # Find which images aren't cached yet
-        missing = []
-        for game in games_to_draw:
-            with _image_lock:
-                cached = self.preloaded_images.get(game["app_id"])
-            if cached is None:
-                missing.append(game)
-
-        if missing:
-            print(f"[Spin] Fetching {len(missing)} missing image(s) before spinning…")
-
-        def _preload_then_spin():
-            """Fetch any missing images in background, then kick off the animation."""
-            for game in missing:
-                app_id = game["app_id"]
-                with _image_lock:
-                    already = self.preloaded_images.get(app_id)
-                if already is None:
-                    img = fetch_header_image(app_id, self.cache_dir,
-                                             game_name=game.get("name", ""))
-                    with _image_lock:
-                        self.preloaded_images[app_id] = img
-
-            # Hand off to the main thread to start the animation
-            self.root.after(0, lambda: self.cycle_images(sample, games_to_draw))
-
-        threading.Thread(target=_preload_then_spin, daemon=True).start()
-
-    def cycle_images(self, selected_games: list, games_to_draw: list):
+        # The strip ends on the winner
+        games_to_draw = [g for g in sample if g is not winner] + [winner]
+        size = self._canvas_size()
+        offsets = reel_plan(len(games_to_draw), size[0])
+
+        # Only the images the reel will actually show, in the order it shows them
+        order, seen = [], set()
+        for offset in [0] + offsets:
+            for index in reel_visible(offset, size[0]):
+                if index < len(games_to_draw) and index not in seen:
+                    seen.add(index)
+                    order.append(index)
+        print(f"[Spin] {len(games_to_draw)} game(s) on the reel, "
+              f"{len(order)} image(s) shown over {len(offsets)} frame(s).")
+
+        if self.reel is not None:
+            self.reel.close()
+        images = ReelImages(games_to_draw, lambda g: self.engine.get_scaled_image(g, size),
+                            order)
+        self.reel = SpinReel(self.canvas, size, images)
+
+        def _wait_then_spin():
+            """Let the first image arrive in the background, then start rolling."""
+            images.get(order[0], REEL_FINAL_WAIT_S)
+            self.root.after(0, lambda: self.animate_images(offsets))
+
+        threading.Thread(target=_wait_then_spin, daemon=True).start()
+
+    def animate_images(self, offsets: list):
         self.active_images = []
         self.label_welcome.config(text="Rolling…")
         self.button_spin.config(text="Spinning…")
-
-        self.canvas.update_idletasks()
-        cw = self.canvas.winfo_width() or 600
-        ch = self.canvas.winfo_height() or 300
-
-        # Place images on canvas side-by-side — all images are guaranteed to be
-        # in preloaded_images now because _preload_then_spin ran first
-        x_pos = 0
-        for game in games_to_draw:
-            app_id = game["app_id"]
-            with _image_lock:
-                img = self.preloaded_images.get(app_id)
-            if img is None:
-                print(f"[Spin] Image still missing for {game.get('name')} — skipping.")
-                continue
-            try:
-                img_r = img.resize((cw, ch), Image.Resampling.LANCZOS)
-                img_tk = ImageTk.PhotoImage(img_r)
-                item = self.canvas.create_image(x_pos, ch // 2, image=img_tk, anchor=tk.CENTER)
-                self.active_images.append((item, img_tk))
-                x_pos += cw
-            except Exception as e:
-                print(f"[Spin] Error placing image for {game.get('name', '?')}: {e}")
-
-        self.animate_images()
-
-    def animate_images(self):
-        cw = self.canvas.winfo_width() or 600
-        total_distance = len(self.active_images) * cw
-        frames = ANIMATION_DURATION_MS // FRAME_DELAY_MS
-        self.animation_speed = max(20, total_distance // frames)
+        reel = self.reel
+        reel.show(0)
+        frames = iter(offsets)
 
         def slide():
-            for item, _ in self.active_images:
-                self.canvas.move(item, -self.animation_speed, 0)
-
-            # Decelerate when the last few images are approaching
-            for item, _ in self.active_images[-3:]:
-                coords = self.canvas.coords(item)
-                if not coords:
-                    continue
-                bbox = self.canvas.bbox(item)
-                if bbox and (coords[0] - (bbox[2] - bbox[0]) / 2) <= 0:
-                    self.animation_speed = max(MIN_SPEED,
-                                               self.animation_speed * SLOWDOWN_FACTOR)
-
-            # Check if last image has scrolled to left edge
-            last_item = self.active_images[-1][0]
-            coords = self.canvas.coords(last_item)
-            if not coords:
-                self.display_selected_game()
+            offset = next(frames, None)
+            if offset is None:
+                # The strip ends on the winner: reuse its frame when it made it
+                img = reel.images.get(len(reel.images) - 1)
+                reel.close()
+                if self.reel is reel:
+                    self.reel = None
+                self.display_selected_game(img)
                 return
-            bbox = self.canvas.bbox(last_item)
-            if bbox:
-                last_left = coords[0] - (bbox[2] - bbox[0]) / 2
-                if last_left <= 0:
-                    self.display_selected_game()
-                    return
-
+            reel.show(offset, final=(offset == offsets[-1]))
             self.animation_id = self.root.after(FRAME_DELAY_MS, slide)
 
         slide()
 
-    def display_selected_game(self):
+    def display_selected_game(self, img: "Image.Image | None" = None):
+        """Show the winner. Without a ready image the reel's last frame stays
+        up while the header is resolved off the main thread."""
         if self.selected_game is None:
             return
-        app_id = self.selected_game["app_id"]
-        img = self.load_image(app_id)
+        game = self.selected_game
         self.label_welcome.config(text="Done!")
-        self.label_game_name.config(text=self.selected_game["name"])
-        self._display_image_on_canvas(img)
+        self.label_game_name.config(text=game["name"])
+        if img is not None:
+            self._display_image_on_canvas(img)
+        else:
+            def _resolve():
+                try:
+                    resolved = self.load_image(game["app_id"])
+                except Exception as e:
+                    print(f"[Spin] Could not prepare image for {game['name']}: {e}")
+                    return
+                self.root.after(0, _show, resolved)
+
+            def _show(resolved):
+                # A spin that started meanwhile owns the canvas
+                if self.selected_game is game and self.reel is None:
+                    self._display_image_on_canvas(resolved)
+
+            threading.Thread(target=_resolve, daemon=True).start()
         self.button_spin.config(state=tk.NORMAL, text="Re-Roll")
         self.button_launch.config(state=tk.NORMAL)
-        self.button_store.config(state=tk.NORMAL)
+        self.button_store.config(
+            state=tk.DISABLED if self.selected_game.get("shortcut") else tk.NORMAL)
 
     # ------------------------------------------------------------------
     # Game actions
     # ------------------------------------------------------------------
     def launch_game(self):
         if self.selected_game:
-            webbrowser.open(f"steam://run/{self.selected_game['app_id']}")
+            webbrowser.open(self.selected_game.get("launch_url")
+                            or f"steam://run/{self.selected_game['app_id']}")
 
     def open_store(self):
-        if self.selected_game:
+        if self.selected_game and not self.selected_game.get("shortcut"):
             webbrowser.open(f"https://store.steampowered.com/app/{self.selected_game['app_id']}")
 
 
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
-def main():
-    steam_path = STEAM_PATH
-    if not steam_path or not os.path.exists(steam_path):
-        print("Steam installation not found.")
-        messagebox.showerror("Steam Roulette", "Could not locate your Steam installation.")
-        return
-
-    cache_dir = create_cache_directory()
-    games = get_installed_games(steam_path)
-    drives = get_drives()
-
-    if not games:
-        messagebox.showerror("Steam Roulette", "No installed Steam games found.")
-        return
+def cli_spin(engine: SteamRouletteEngine, as_json: bool = False,
+             launch: bool = False) -> int:
+    """Pick a game without opening a window. Progress goes to stderr so
+    stdout carries only the result."""
+    with contextlib.redirect_stdout(sys.stderr):
+        engine.scan()
+        engine.load_exclusions()
+        winner, _ = engine.pick()
+        # appinfo.vdf knows about tools/DLC the manifests don't flag
+        while winner is not None and engine.is_non_game(winner):
+            engine.apply_library_delta([], [str(winner["app_id"])])
+            winner, _ = engine.pick()
+
+    if winner is None:
+        print("No valid games available to spin.", file=sys.stderr)
+        return 1
+    summary = game_summary(winner, engine.cache_dir)
+    if as_json:
+        print(json.dumps(summary))
+    else:
+        print(f"{summary['name']} ({summary['app_id']})")
+    if launch:
+        webbrowser.open(summary["launch_url"])
+    startup_mark("spin result")
+    return 0
+
+
+def _print_startup_report() -> bool:
+    # The log window captures sys.stderr, so write to the real one
+    text, within_budget = startup_report()
+    print(text, file=sys.__stderr__)
+    return within_budget
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="SteamRoulette",
+                                     description="Pick a random game from your Steam library.")
+    parser.add_argument("--spin", action="store_true",
+                        help="pick a game without opening the window")
+    parser.add_argument("--json", action="store_true",
+                        help="with --spin, print the result as JSON")
+    parser.add_argument("--launch", action="store_true",
+                        help="with --spin, launch the picked game")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print per-phase startup times once the window (or --spin "
+                             "result) is up, then exit; exit status 1 if over budget")
+    args = parser.parse_args(argv)
+
+    engine = SteamRouletteEngine.discover()
+    startup_mark("steam discovery")
+    if engine is None:
+        print("Steam installation not found.", file=sys.stderr if args.spin else sys.stdout)
+        if not args.spin:
+            messagebox.showerror("Steam Roulette", "Could not locate your Steam installation.")
+        return 1
+
+    if args.spin:
+        status = cli_spin(engine, args.json, args.launch)
+        if args.startup_report and not _print_startup_report():
+            status = status or 1
+        return status
+
+    engine.load_snapshot()
+    startup_mark("snapshot")
 
     root = tk.Tk()
-    app = SteamRouletteGUI(root, games, drives)
-    app.cache_dir = cache_dir
+    startup_mark("tk root")
+    app = SteamRouletteGUI(root, engine)
+    startup_mark("window built")
+    status = [0]
+
+    def _first_window():
+        # Idle callbacks run in order, so this fires after Tk's first draw
+        startup_mark("first window")
+        if args.startup_report:
+            status[0] = 0 if _print_startup_report() else 1
+            root.destroy()
+
+    root.after_idle(_first_window)
     root.mainloop()
+    engine.stop_watcher()
     app.log_window.restore()
+    if app.is_library_loaded:
+        engine.save_snapshot()
+    engine.save_caches()
+    return status[0]
+
 
+startup_mark("module import")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
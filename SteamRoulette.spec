@@ -6,7 +6,10 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('apikey.txt', '.'), ('SteamRouletteIcon.ico', '.'), ('SteamRouletteLogo.png', '.')],
-    hiddenimports=[],
+    # Loaded through _LazyModule (importlib), which PyInstaller cannot see
+    hiddenimports=['tkinter', 'tkinter.ttk', 'tkinter.messagebox',
+                   'PIL', 'PIL.Image', 'PIL.ImageDraw', 'PIL.ImageFont', 'PIL.ImageTk',
+                   'requests', 'vdf', 'asyncio'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
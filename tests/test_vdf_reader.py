@@ -0,0 +1,116 @@
+"""The targeted VDF readers must agree with a full vdf.parse."""
+import pytest
+import vdf
+
+import SteamRoulette as sr
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8", newline="")
+    return str(path)
+
+
+def _vdf_game(path, library_path):
+    with open(path, "r", encoding="utf-8-sig") as fh:
+        state = vdf.parse(fh).get("AppState", {})
+    return {"app_id": state.get("appid"), "name": state.get("name"), "path": library_path}
+
+
+def _vdf_libraries(path):
+    with open(path, "r", encoding="utf-8-sig") as fh:
+        folders = vdf.parse(fh).get("libraryfolders", {})
+    return {key: block["path"] for key, block in folders.items()
+            if isinstance(block, dict) and "path" in block}
+
+
+def _depots(app_id, count):
+    return "".join(
+        f'\t\t"{app_id + d}"\n\t\t{{\n\t\t\t"manifest"\t\t"{7_000_000_000 + d}"\n'
+        f'\t\t\t"size"\t\t"{d * 1_048_576}"\n\t\t}}\n' for d in range(1, count + 1))
+
+
+MANIFESTS = {
+    "plain": (
+        '"AppState"\n{\n\t"appid"\t\t"440"\n\t"universe"\t\t"1"\n'
+        '\t"name"\t\t"Team Fortress 2"\n\t"StateFlags"\t\t"4"\n'
+        '\t"installdir"\t\t"Team Fortress 2"\n}\n'),
+    "escapes and unicode": (
+        '"AppState"\n{\n\t"appid"\t\t"12"\n'
+        '\t"LauncherPath"\t\t"C:\\\\Program Files (x86)\\\\Steam\\\\steam.exe"\n'
+        '\t"name"\t\t"The \\"Quoted\\" Édition\\\\Tab\\there"\n}\n'),
+    "late name": (
+        '"AppState"\n{\n\t"appid"\t\t"100"\n'
+        '\t"UserConfig"\n\t{\n\t\t"name"\t\t"not this one"\n\t\t"language"\t\t"english"\n\t}\n'
+        f'\t"InstalledDepots"\n\t{{\n{_depots(100, 5)}\t}}\n'
+        '\t"name"\t\t"Late Name"\n}\n'),
+    "late name past the first chunk": (
+        '"AppState"\n{\n\t"appid"\t\t"200"\n'
+        f'\t"InstalledDepots"\n\t{{\n{_depots(200, 400)}\t}}\n'
+        '\t"name"\t\t"Far Away"\n}\n'),
+    "comments and conditionals": (
+        '// written by hand\n"AppState"\n{\n'
+        '\t// "appid" "1"\n\t"appid"\t\t"300"\n'
+        '\t"Section" [$WIN32]\n\t{\n\t\t"name"\t\t"windows only"\n\t}\n'
+        '\t"name"\t\t"Conditional" [$WIN32||$OSX]\n'
+        '\t"installdir"\t\t"x" // trailing comment\n}\n'),
+    "bare tokens and BOM": (
+        '\ufeffAppState\n{\n\tappid 400\n\tname "Bare Key"\n}\n'),
+    "no name": '"AppState"\n{\n\t"appid"\t\t"500"\n}\n',
+    "other section first": (
+        '"Other"\n{\n\t"appid"\t\t"1"\n\t"name"\t\t"wrong"\n}\n'
+        '"AppState"\n{\n\t"appid"\t\t"600"\n\t"name"\t\t"Second Section"\n}\n'),
+}
+
+
+@pytest.mark.parametrize("text", MANIFESTS.values(), ids=MANIFESTS.keys())
+def test_fetch_game_data_matches_vdf(tmp_path, text):
+    path = _write(tmp_path, "appmanifest.acf", text)
+    assert sr.fetch_game_data(path, "D:\\Games") == _vdf_game(path, "D:\\Games")
+
+
+def test_late_name_past_first_chunk_needs_full_read(tmp_path):
+    text = MANIFESTS["late name past the first chunk"]
+    assert len(text.encode("utf-8")) > sr.ACF_READ_CHUNK
+    path = _write(tmp_path, "appmanifest.acf", text)
+    assert sr.read_vdf_fields(path, "AppState", ("name",)) == {"name": "Far Away"}
+
+
+LIBRARY_FOLDERS = {
+    "current format": (
+        '"libraryfolders"\n{\n'
+        '\t"0"\n\t{\n\t\t"path"\t\t"C:\\\\Program Files (x86)\\\\Steam"\n'
+        '\t\t"label"\t\t""\n\t\t"contentid"\t\t"6427510935414950000"\n'
+        '\t\t"totalsize"\t\t"0"\n\t\t"update_clean_bytes_tally"\t\t"48211968"\n'
+        '\t\t"time_last_update_corruption"\t\t"0"\n'
+        '\t\t"apps"\n\t\t{\n\t\t\t"228980"\t\t"434614040"\n\t\t\t"440"\t\t"26651860032"\n\t\t}\n\t}\n'
+        '\t"1"\n\t{\n\t\t"path"\t\t"D:\\\\SteamLibrary"\n\t\t"label"\t\t"Games"\n'
+        '\t\t"apps"\n\t\t{\n\t\t\t"570"\t\t"1"\n\t\t}\n\t}\n}\n'),
+    "path after apps": (
+        '"libraryfolders"\n{\n'
+        '\t"0"\n\t{\n\t\t"label"\t\t""\n'
+        '\t\t"apps"\n\t\t{\n\t\t\t"228980"\t\t"434614040"\n\t\t\t"path"\t\t"not a library"\n\t\t}\n'
+        '\t\t"path"\t\t"E:\\\\Steam Games\\\\\\"Quoted\\""\n\t}\n}\n'),
+    "legacy format": (
+        '"LibraryFolders"\n{\n\t"TimeNextStatsReport"\t\t"1700000000"\n'
+        '\t"ContentStatsID"\t\t"-123"\n\t"1"\t\t"D:\\\\SteamLibrary"\n}\n'),
+    "comments, conditionals, unix paths": (
+        '// libraries\n"libraryfolders"\n{\n'
+        '\t"contentstatsid"\t\t"-1"\n'
+        '\t"0" [$LINUX]\n\t{\n\t\t// main\n\t\t"path"\t\t"/home/user/.local/share/Steam"\n'
+        '\t\t"apps"\n\t\t{\n\t\t}\n\t}\n'
+        '\t"1"\n\t{\n\t\t"label"\t\t"{odd} label"\n\t\t"path"\t\t"/mnt/games"\n\t}\n}\n'),
+}
+
+
+@pytest.mark.parametrize("text", LIBRARY_FOLDERS.values(), ids=LIBRARY_FOLDERS.keys())
+def test_parse_vdf_matches_vdf(tmp_path, text):
+    path = _write(tmp_path, "libraryfolders.vdf", text)
+    assert sr.parse_vdf(path) == _vdf_libraries(path)
+
+
+def test_parse_vdf_real_format(tmp_path):
+    path = _write(tmp_path, "libraryfolders.vdf", LIBRARY_FOLDERS["current format"])
+    assert sr.parse_vdf(path) == {"0": "C:\\Program Files (x86)\\Steam", "1": "D:\\SteamLibrary"}
+    path = _write(tmp_path, "after.vdf", LIBRARY_FOLDERS["path after apps"])
+    assert sr.parse_vdf(path) == {"0": 'E:\\Steam Games\\"Quoted"'}
@@ -0,0 +1,103 @@
+"""Benchmark SteamRoulette's targeted manifest reader against a full vdf.parse.
+
+    python tools/bench_acf.py [N]
+
+Writes N synthetic appmanifest files to a temporary directory, reads them
+with both readers and prints the best-of-3 time for each. Exits with status 1
+if the two readers disagree on any manifest.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vdf  # noqa: E402
+
+from SteamRoulette import fetch_game_data  # noqa: E402
+
+
+def fetch_game_data_vdf(acf_path: str, library_path: str) -> dict:
+    """Reference implementation using a full vdf.parse."""
+    try:
+        with open(acf_path, "r", encoding="utf-8") as fh:
+            content = vdf.parse(fh).get("AppState", {})
+        return {
+            "app_id": content.get("appid"),
+            "name": content.get("name"),
+            "path": library_path,
+        }
+    except Exception as e:
+        print(f"Error reading ACF file {acf_path}: {e}")
+        return {}
+
+
+def write_synthetic_manifest(path: str, app_id: int, depots: int,
+                             late_name: bool = False) -> None:
+    depot_lines = "".join(
+        f'\t\t"{app_id + d}"\n\t\t{{\n\t\t\t"manifest"\t\t"{7_000_000_000 + d}"\n'
+        f'\t\t\t"size"\t\t"{d * 1_048_576}"\n\t\t\t"dlcappid"\t\t"{app_id}"\n\t\t}}\n'
+        for d in range(1, depots + 1))
+    name = f'\t"name"\t\t"Synthetic \\"Game\\" {app_id} — Édition"\n'
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(
+            f'"AppState"\n{{\n\t"appid"\t\t"{app_id}"\n\t"universe"\t\t"1"\n'
+            f'\t"LauncherPath"\t\t"C:\\\\Program Files (x86)\\\\Steam\\\\steam.exe"\n'
+            f'{"" if late_name else name}'
+            f'\t"StateFlags"\t\t"4"\n\t"installdir"\t\t"Game{app_id}"\n'
+            f'\t"UserConfig"\n\t{{\n\t\t"language"\t\t"english"\n\t\t"betakey"\t\t"public"\n\t}}\n'
+            f'\t"InstalledDepots"\n\t{{\n{depot_lines}\t}}\n'
+            f'{name if late_name else ""}'
+            f'\t"SharedDepots"\n\t{{\n\t\t"228988"\t\t"228980"\n\t}}\n}}\n')
+
+
+def benchmark(count: int = 2500, depots: int = 40, repeat: int = 3) -> bool:
+    """Print the best-of-`repeat` time for each reader and return True when
+    both produce identical game records for every manifest."""
+    with tempfile.TemporaryDirectory() as tmp:
+        steamapps = os.path.join(tmp, "steamapps")
+        os.makedirs(steamapps)
+        paths = []
+        for i in range(count):
+            path = os.path.join(steamapps, f"appmanifest_{100000 + i}.acf")
+            # Steam writes "name" near the top; put it after the big blocks in
+            # every tenth file to exercise the full-read path as well
+            write_synthetic_manifest(path, 100000 + i, depots, late_name=(i % 10 == 0))
+            paths.append(path)
+
+        results = {}
+        for label, reader in (("vdf.parse", fetch_game_data_vdf),
+                              ("read_vdf_fields", fetch_game_data)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                records = [reader(p, tmp) for p in paths]
+                best = min(best, time.perf_counter() - start)
+            results[label] = (best, records)
+            print(f"[Bench] {label:<16} {count} manifests in {best * 1000:8.1f} ms "
+                  f"({best / count * 1e6:6.1f} µs each)")
+
+    full_time, full_records = results["vdf.parse"]
+    fast_time, fast_records = results["read_vdf_fields"]
+    mismatches = [(a, b) for a, b in zip(full_records, fast_records) if a != b]
+    print(f"[Bench] Speed-up: {full_time / fast_time:.1f}x — "
+          f"{len(mismatches)} mismatching record(s).")
+    for a, b in mismatches[:5]:
+        print(f"[Bench]   vdf.parse={a!r} read_vdf_fields={b!r}")
+    return not mismatches
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("count", type=int, nargs="?", default=2500,
+                        help="number of synthetic manifests (default 2500)")
+    parser.add_argument("--depots", type=int, default=40,
+                        help="InstalledDepots entries per manifest (default 40)")
+    args = parser.parse_args(argv)
+    return 0 if benchmark(args.count, args.depots) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())